@@ -0,0 +1,181 @@
+"""Microbenchmarks reproducibles de los caminos calientes de MemoryManager.
+
+Mide worst_fit, allocate_memory, deallocate_memory, _free_blocks y stats con
+memorias de 1e3 a 1e7 unidades en estado estacionario: la memoria se llena
+hasta ~50% con bloques de tamaño proporcional a la memoria y cada operación
+medida se compensa (asignar/liberar) para que el estado no se desvíe.
+
+Backends: "extents" (MemoryManager), "numpy" (ArrayMemoryManager, si NumPy
+está instalado) y "listscan", la implementación original de una celda por
+unidad, como referencia.
+
+Uso:
+    python bench.py --json actual.json
+    python bench.py --sizes 1000 100000 --compare actual.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from memory_manager import MemoryManager
+
+OPS = ("worst_fit", "allocate_memory", "deallocate_memory", "_free_blocks", "stats")
+LIVE_BLOCKS = 500  # bloques vivos en estado estacionario, igual para todos los tamaños
+
+
+class ListScanMemoryManager:
+    """Implementación original (lista de celdas y recorridos completos), como referencia"""
+
+    def __init__(self, total_memory=100):
+        self.total_memory = total_memory
+        self.memory = [None] * total_memory
+
+    def _free_blocks(self):
+        blocks = []
+        start = None
+        for i, cell in enumerate(self.memory + [1]):
+            if cell is None:
+                if start is None:
+                    start = i
+            else:
+                if start is not None:
+                    blocks.append((start, i - start))
+                    start = None
+        return blocks
+
+    def worst_fit(self, process_name, size):
+        blocks = self._free_blocks()
+        best = max(((s, l) for s, l in blocks if l >= size), key=lambda x: x[1], default=None)
+        if best:
+            self.allocate_memory(best[0], process_name, size)
+            return best[0]
+        return -1
+
+    def allocate_memory(self, start, process_name, size):
+        for i in range(start, start + size):
+            self.memory[i] = process_name
+
+    def deallocate_memory(self, process_name):
+        for i, v in enumerate(self.memory):
+            if v == process_name:
+                self.memory[i] = None
+
+    def stats(self):
+        used = sum(1 for c in self.memory if c is not None)
+        blocks = self._free_blocks()
+        return used, self.total_memory - used, len(blocks), max((b for _, b in blocks), default=0)
+
+
+def backends():
+    found = {"extents": lambda n: MemoryManager(n, history_size=0), "listscan": ListScanMemoryManager}
+    try:
+        from numpy_manager import ArrayMemoryManager
+        found["numpy"] = lambda n: ArrayMemoryManager(n, history_size=0)
+    except ImportError:
+        pass
+    return found
+
+
+def prefill(manager, total, rng):
+    """Coloca ~LIVE_BLOCKS bloques separados por huecos; devuelve {nombre: (start, size)}"""
+    unit = max(1, total // (2 * LIVE_BLOCKS))
+    live, pos, i = {}, 0, 0
+    while True:
+        size = rng.randint(1, 2 * unit)
+        gap = rng.randint(0, 2 * unit)
+        if pos + gap + size > total:
+            return live
+        manager.allocate_memory(pos + gap, f"B{i}", size)
+        live[f"B{i}"] = (pos + gap, size)
+        pos += gap + size
+        i += 1
+
+
+def bench_op(make, op, total, seed, reps, budget):
+    """Devuelve las duraciones (ns) de hasta reps llamadas a op, sin pasar de budget segundos"""
+    rng = random.Random(seed)
+    manager = make(total)
+    live = prefill(manager, total, rng)
+    names = list(live)
+    unit = max(1, total // (2 * LIVE_BLOCKS))
+    times = []
+    clock = time.perf_counter_ns
+    deadline = time.perf_counter() + budget
+    for r in range(reps):
+        if time.perf_counter() > deadline and times:
+            break
+        if op == "worst_fit":
+            name = f"W{r}"
+            t = clock(); start = manager.worst_fit(name, rng.randint(1, unit)); times.append(clock() - t)
+            if start != -1:
+                manager.deallocate_memory(name)
+        elif op == "allocate_memory":
+            victim = names[rng.randrange(len(names))]
+            start, size = live[victim]
+            manager.deallocate_memory(victim)
+            t = clock(); manager.allocate_memory(start, victim, size); times.append(clock() - t)
+        elif op == "deallocate_memory":
+            victim = names[rng.randrange(len(names))]
+            start, size = live[victim]
+            t = clock(); manager.deallocate_memory(victim); times.append(clock() - t)
+            manager.allocate_memory(start, victim, size)
+        else:
+            fn = getattr(manager, op)
+            t = clock(); fn(); times.append(clock() - t)
+    return times
+
+
+def summarize(times):
+    times = sorted(times)
+    return {"n": len(times), "mean_ns": statistics.fmean(times), "median_ns": statistics.median(times),
+            "p95_ns": times[min(len(times) - 1, int(len(times) * 0.95))]}
+
+
+def main(argv=None):
+    available = backends()
+    ap = argparse.ArgumentParser(description="Microbenchmarks de MemoryManager")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    ap.add_argument("--backends", nargs="+", choices=sorted(available), default=sorted(available))
+    ap.add_argument("--ops", nargs="+", choices=OPS, default=list(OPS))
+    ap.add_argument("--reps", type=int, default=2000, help="llamadas medidas por caso")
+    ap.add_argument("--budget", type=float, default=2.0, help="segundos máximos por caso")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", metavar="SALIDA", help="guarda los resultados en JSON")
+    ap.add_argument("--compare", metavar="BASE", help="JSON de una corrida anterior para comparar")
+    args = ap.parse_args(argv)
+
+    base = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = {(r["backend"], r["op"], r["memory"]): r for r in json.load(f)["results"]}
+
+    results = []
+    print(f"{'backend':<9} {'op':<18} {'memoria':>9} {'n':>6} {'mediana µs':>11} {'p95 µs':>10}" + ("  vs base" if base else ""))
+    for name in args.backends:
+        for total in args.sizes:
+            for op in args.ops:
+                row = {"backend": name, "op": op, "memory": total,
+                       **summarize(bench_op(available[name], op, total, args.seed, args.reps, args.budget))}
+                results.append(row)
+                line = f"{name:<9} {op:<18} {total:>9} {row['n']:>6} {row['median_ns'] / 1e3:>11.2f} {row['p95_ns'] / 1e3:>10.2f}"
+                old = base.get((name, op, total))
+                if old:
+                    line += f"  x{old['median_ns'] / row['median_ns']:.2f}"
+                print(line, flush=True)
+
+    if args.json:
+        meta = {"python": platform.python_version(), "platform": platform.platform(),
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "seed": args.seed, "reps": args.reps, "budget": args.budget}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
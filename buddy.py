@@ -0,0 +1,182 @@
+"""Asignador buddy (sistema de compañeros) para el simulador.
+
+La memoria se parte en bloques de tamaño potencia de dos. Cada petición toma
+el bloque libre más pequeño de orden suficiente (el de menor dirección) y lo
+divide a la mitad hasta ajustarse; al liberar, el bloque se fusiona con su
+compañero mientras este también esté libre. Las listas libres son por orden,
+así que asignar y liberar cuestan O(log n) y el peor caso está acotado.
+
+Si el tamaño total no es potencia de dos se usan varias raíces alineadas
+(p. ej. 50 = 32 + 16 + 2); los bloques nunca se fusionan por encima de su raíz.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+
+from compaction import CompactionResult
+from memory_manager import MemoryManager
+from strategies import FitStrategy
+
+BuddyStats = namedtuple("BuddyStats", "used free fragmentation largest internal")
+
+
+def order_for(size):
+    """Menor orden k con 2**k >= size"""
+    return max(0, (size - 1).bit_length())
+
+
+class BuddyIndex:
+    """Listas libres por orden con la interfaz de FreeBlockIndex"""
+
+    def __init__(self, total_memory):
+        self._free = {}       # orden -> inicios libres ordenados
+        self.free_order = {}  # inicio libre -> orden
+        self.allocated = {}   # inicio asignado -> orden
+        self._roots = []      # (inicio, orden) de cada raíz
+        pos = 0
+        for k in range(total_memory.bit_length() - 1, -1, -1):
+            if total_memory >> k & 1:
+                self._roots.append((pos, k))
+                self._push(pos, k)
+                pos += 1 << k
+        self._root_starts = [s for s, _ in self._roots]
+        self.max_order = self._roots[0][1] if self._roots else 0
+
+    def __len__(self):
+        return len(self.free_order)
+
+    def _push(self, start, order):
+        insort(self._free.setdefault(order, []), start)
+        self.free_order[start] = order
+
+    def _pop(self, start, order):
+        starts = self._free[order]
+        del starts[bisect_left(starts, start)]
+        if not starts:
+            del self._free[order]
+        del self.free_order[start]
+
+    def _root_order(self, start):
+        return self._roots[bisect_right(self._root_starts, start) - 1][1]
+
+    def find(self, size):
+        """(start, tamaño) del bloque libre más pequeño donde cabe size, o None"""
+        for k in range(order_for(size), self.max_order + 1):
+            starts = self._free.get(k)
+            if starts:
+                return starts[0], 1 << k
+        return None
+
+    def blocks(self):
+        return sorted((s, 1 << k) for s, k in self.free_order.items())
+
+    def largest(self):
+        for k in range(self.max_order, -1, -1):
+            starts = self._free.get(k)
+            if starts:
+                return starts[0], 1 << k
+        return None
+
+    def containing(self, pos):
+        for k in self._free:
+            s = pos >> k << k  # las raíces están alineadas, así que los bloques también
+            if self.free_order.get(s) == k:
+                return s, 1 << k
+        return None
+
+    def carve(self, start, size):
+        """Divide el bloque libre que contiene start hasta dejar uno de orden justo en start"""
+        k = order_for(size)
+        block = self.containing(start)
+        if block is None or start % (1 << k) or block[1] < (1 << k):
+            raise ValueError(f"Rango {start}+{size} no es un bloque buddy libre")
+        s, j = block[0], block[1].bit_length() - 1
+        self._pop(s, j)
+        while j > k:
+            j -= 1
+            half = s + (1 << j)
+            if start >= half:
+                self._push(s, j)
+                s = half
+            else:
+                self._push(half, j)
+        self.allocated[start] = k
+
+    def release(self, start, size):
+        """Libera el bloque y lo fusiona con su compañero mientras se pueda"""
+        k = self.allocated.pop(start)
+        root = self._root_order(start)
+        while k < root:
+            buddy = start ^ (1 << k)
+            if self.free_order.get(buddy) != k:
+                break
+            self._pop(buddy, k)
+            start = min(start, buddy)
+            k += 1
+        self._push(start, k)
+
+
+class BuddyFit(FitStrategy):
+    key, label = "buddy", "Sistema Buddy"
+
+    def find(self, index, size):
+        return index.find(size)
+
+
+class BuddyMemoryManager(MemoryManager):
+    """MemoryManager que ubica los procesos con el sistema buddy"""
+
+    def __init__(self, total_memory=100, strategy="buddy", **kwargs):
+        self.internal = 0  # unidades reservadas por redondeo a potencia de dos
+        super().__init__(total_memory, strategy, **kwargs)
+
+    def _make_index(self, total_memory):
+        return BuddyIndex(total_memory)
+
+    def _get_strategy(self, key):
+        # Cualquier *_fit usa la ubicación buddy: es la única válida sobre este índice
+        strategy = self._strategies.get("buddy")
+        if strategy is None:
+            strategy = self._strategies["buddy"] = BuddyFit()
+        return strategy
+
+    def _place(self, start, process_name, size):
+        super()._place(start, process_name, size)
+        self.internal += (1 << order_for(size)) - size
+
+    def _unplace(self, process_name):
+        entry = super()._unplace(process_name)
+        if entry is not None:
+            self.internal -= (1 << order_for(entry[1])) - entry[1]
+        return entry
+
+    def _restore_index(self, starts, sizes):
+        # Con fusión inmediata el árbol libre queda determinado por los bloques asignados
+        self.free_index = BuddyIndex(self.total_memory)
+        self.internal = 0
+        for start, size in zip(starts, sizes):
+            self.free_index.carve(start, size)
+            self.internal += (1 << order_for(size)) - size
+
+    def compact(self):
+        """Los bloques buddy dependen de su alineación: no se mueven"""
+        return CompactionResult(0, 0, 0.0)
+
+    def buddy_blocks(self, lo=0, hi=None):
+        """Bloques del árbol (start, orden, dueño o None) que intersectan [lo, hi)"""
+        hi = self.total_memory if hi is None else hi
+        index = self.free_index
+        owners = {start: owner for start, _, owner in self.extents(lo, hi)}
+        out = [(s, k, owners.get(s)) for s, k in index.allocated.items() if s < hi and s + (1 << k) > lo]
+        out += [(s, k, None) for s, k in index.free_order.items() if s < hi and s + (1 << k) > lo]
+        out.sort()
+        return out
+
+    @property
+    def max_request(self):
+        return 1 << self.free_index.max_order if self.total_memory else 0
+
+    def stats(self):
+        """BuddyStats: como MemoryStats más la fragmentación interna en unidades"""
+        largest = self.free_index.largest()
+        return BuddyStats(self.used, self.total_memory - self.used - self.internal, len(self.free_index),
+                          largest[1] if largest else 0, self.internal)
@@ -0,0 +1,108 @@
+"""Planificación de la compactación de memoria.
+
+Compactar deja todos los huecos en uno solo de tamaño F (la memoria libre).
+Se comparan dos familias de planes y se elige el de menos unidades movidas:
+
+- Punto de corte (conserva el orden de los tramos): los tramos antes del
+  corte k se deslizan a la izquierda (empaquetados desde 0) y los demás a la
+  derecha (empaquetados hasta el final), con el hueco en medio. Un tramo que
+  ya está en su sitio no cuesta nada; todos los cortes se prueban en O(n).
+- Ventana: el hueco final es una ventana [h, h+F) con bordes en bordes de
+  tramos; los tramos de adentro se reparten en los huecos de afuera (mejor
+  ajuste decreciente) y los demás no se mueven. Llena huecos con tramos de
+  otro lugar, p. ej. un tramo chico al final que tapa un hueco del principio.
+
+El óptimo general es un problema de empaquetado (NP-difícil); estas dos
+familias cubren los casos comunes sin búsqueda exponencial.
+"""
+from bisect import bisect_left, insort
+from collections import namedtuple
+from itertools import accumulate
+
+# Coste de una compactación: tramos movidos, unidades movidas y segundos
+CompactionResult = namedtuple("CompactionResult", "blocks units elapsed")
+
+
+def _split_plan(extents, total_memory):
+    """Plan de punto de corte más barato: (unidades, movimientos)"""
+    n = len(extents)
+    # left[k]: unidades movidas al empaquetar a la izquierda los k primeros tramos
+    left = [0] * (n + 1)
+    pos = 0
+    for i, (start, size, _) in enumerate(extents):
+        left[i + 1] = left[i] + (size if start != pos else 0)
+        pos += size
+    # right[k]: unidades movidas al empaquetar a la derecha los tramos desde k
+    right = [0] * (n + 1)
+    pos = total_memory
+    for i in range(n - 1, -1, -1):
+        start, size, _ = extents[i]
+        pos -= size
+        right[i] = right[i + 1] + (size if start != pos else 0)
+    # Ante empate, el corte más a la derecha (hueco al final, como la compactación clásica)
+    k = min(range(n, -1, -1), key=lambda k: left[k] + right[k])
+
+    # Izquierda primero y en orden creciente, derecha después y en orden decreciente:
+    # ejecutados así, cada destino ya está libre cuando le toca
+    moves = []
+    pos = 0
+    for start, size, owner in extents[:k]:
+        if start != pos:
+            moves.append((owner, start, pos, size))
+        pos += size
+    pos = total_memory
+    for start, size, owner in reversed(extents[k:]):
+        pos -= size
+        if start != pos:
+            moves.append((owner, start, pos, size))
+    return left[k] + right[k], moves
+
+
+def _pack(blocks, gaps):
+    """Reparte blocks (start, size, owner) en gaps [start, size] con mejor ajuste decreciente;
+    devuelve los movimientos o None si alguno no entra"""
+    free = sorted((size, start) for start, size in gaps)  # (espacio restante, próxima dirección)
+    moves = []
+    for start, size, owner in sorted(blocks, key=lambda b: -b[1]):
+        i = bisect_left(free, (size, -1))
+        if i == len(free):
+            return None
+        room, pos = free.pop(i)
+        moves.append((owner, start, pos, size))
+        if room > size:
+            insort(free, (room - size, pos + size))
+    return moves
+
+
+def plan_compaction(extents, total_memory):
+    """Devuelve los movimientos [(owner, old_start, new_start, size)] del plan más barato.
+
+    ``extents`` son tramos (start, size, owner) ordenados por dirección. Los
+    movimientos se pueden ejecutar en el orden devuelto: cada destino ya está
+    libre cuando le toca.
+    """
+    best, moves = _split_plan(extents, total_memory)
+    free = total_memory - sum(size for _, size, _ in extents)
+    if not best or not free:
+        return moves
+    starts = [start for start, _, _ in extents]
+    units = [0, *accumulate(size for _, size, _ in extents)]  # unidades de los i primeros tramos
+    gaps, pos = [], 0
+    for start, size, _ in extents:
+        if start > pos:
+            gaps.append((pos, start - pos))
+        pos = start + size
+    if pos < total_memory:
+        gaps.append((pos, total_memory - pos))
+    gap_starts = [start for start, _ in gaps]
+    edges = {0, total_memory, *starts, *(start + size for start, size, _ in extents)}
+    for h in sorted(e for e in edges if e + free in edges):
+        i, j = bisect_left(starts, h), bisect_left(starts, h + free)
+        cost = units[j] - units[i]  # los tramos dentro de la ventana
+        if cost >= best:
+            continue
+        a, b = bisect_left(gap_starts, h), bisect_left(gap_starts, h + free)
+        plan = _pack(extents[i:j], gaps[:a] + gaps[b:])
+        if plan is not None:
+            best, moves = cost, plan
+    return moves
@@ -0,0 +1,90 @@
+"""Historial acotado de operaciones del administrador de memoria.
+
+Los eventos se guardan como tuplas compactas (op, pid, size, start, block,
+label) en un buffer circular; label es la política vigente al registrarlos,
+así un cambio de estrategia no renombra lo anterior. El texto solo se
+genera al mostrarlos o exportarlos.
+Opcionalmente los eventos que salen del buffer se vuelcan a un archivo, que
+se vacía al crear el historial y en clear().
+"""
+from collections import deque, namedtuple
+
+HistoryEvent = namedtuple("HistoryEvent", "op pid size start block label")
+
+ALLOC, FAIL, FREE, NOTE, COMPACT = "alloc", "fail", "free", "note", "compact"
+
+
+def format_event(event, label="Peor Ajuste"):
+    """Texto del evento tal como aparece en el panel de historial"""
+    op, pid, size, start, block = event[:5]
+    if op == ALLOC:
+        return f"Asignado {pid} (tamaño {size}) en {start} - {label} (bloque {block})"
+    if op == FAIL:
+        return f"FALLÓ asignar {pid} (tamaño {size}) - Sin espacio"
+    if op == FREE:
+        return f"Liberado proceso {pid}"
+    if op == COMPACT:
+        return f"Compactación: {block} bloques movidos ({size} unidades)"
+    return str(pid)
+
+
+class EventHistory:
+    def __init__(self, maxlen=1000, spill_path=None, formatter=format_event):
+        self._events = deque(maxlen=maxlen)
+        self.formatter = formatter
+        self.label = "Peor Ajuste"
+        self.total = 0         # eventos registrados desde el inicio
+        self.listeners = []    # callbacks que reciben cada evento (op, pid, size, start, block)
+        self._spill = open(spill_path, "w", encoding="utf-8", buffering=1 << 16) if spill_path else None
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        return (HistoryEvent(*e) for e in self._events)
+
+    def record(self, op, pid, size=0, start=-1, block=0):
+        events = self._events
+        if self._spill is not None and len(events) == events.maxlen and events.maxlen:
+            self._spill.write("\t".join(map(str, events[0])) + "\n")
+        events.append((op, pid, size, start, block, self.label))
+        self.total += 1
+        if self.listeners:
+            for callback in self.listeners:
+                callback(op, pid, size, start, block)
+
+    def append(self, text):
+        """Agrega una nota de texto libre (p. ej. marcas de inicio de demo)"""
+        self.record(NOTE, text)
+
+    def clear(self):
+        self._events.clear()
+        if self._spill is not None:
+            self._spill.seek(0)
+            self._spill.truncate()
+
+    def format(self, event):
+        return self.formatter(event, event[5])
+
+    def tail(self, n):
+        """Devuelve las últimas n entradas ya formateadas"""
+        events = self._events
+        start = max(0, len(events) - n)
+        return [self.format(events[i]) for i in range(start, len(events))]
+
+    def export(self, path):
+        """Escribe como texto lo volcado a disco más lo que queda en memoria"""
+        with open(path, "w", encoding="utf-8") as out:
+            if self._spill is not None:
+                self._spill.flush()
+                with open(self._spill.name, encoding="utf-8") as spilled:
+                    for line in spilled:
+                        op, pid, size, start, block, label = line.rstrip("\n").split("\t")
+                        out.write(self.format((op, pid, int(size), int(start), int(block), label)) + "\n")
+            for event in self._events:
+                out.write(self.format(event) + "\n")
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
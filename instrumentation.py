@@ -0,0 +1,170 @@
+"""Instrumentación integrada: latencias por operación y contadores.
+
+Profiler envuelve métodos de un objeto concreto (administrador, ventana,
+canvas) reemplazándolos por atributos de instancia que miden cada llamada
+con perf_counter_ns; al quitar la instrumentación se borran esos atributos
+y vuelven los métodos de la clase sin ningún coste. Cada operación acumula
+un histograma log-lineal en ns (8 cubetas por potencia de dos, error menor
+al 12,5%), así que la memoria es fija aunque la corrida sea larga.
+
+Uso sin interfaz:
+    python replay.py traza.bin --memory 1000000 --profile perfil.json
+"""
+import csv
+import json
+import time
+from functools import wraps
+
+SUB = 8                    # cubetas por potencia de dos
+BUCKETS = SUB + 45 * SUB   # hasta 2**48 ns ≈ 78 h
+
+
+def bucket_of(ns):
+    if ns < SUB:
+        return ns
+    e = ns.bit_length() - 1
+    return min(BUCKETS - 1, SUB + (e - 3) * SUB + ((ns >> (e - 3)) & (SUB - 1)))
+
+
+def bucket_upper(i):
+    """Límite superior (exclusivo) de la cubeta i en ns"""
+    if i < SUB:
+        return i + 1
+    e, sub = divmod(i - SUB, SUB)
+    return (SUB + sub + 1) << e
+
+
+class LatencyHistogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = self.total = self.max = 0
+        self.min = None
+        self.buckets = [0] * BUCKETS  # ver bucket_of
+
+    def record(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        self.buckets[bucket_of(ns)] += 1
+
+    def percentile(self, p):
+        """Cota superior de la cubeta donde cae el percentil p (0-100)"""
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.max, bucket_upper(i))
+        return self.max
+
+    def summary(self):
+        return {"count": self.count, "total_ns": self.total, "mean_ns": self.total / self.count if self.count else 0,
+                "min_ns": self.min or 0, "max_ns": self.max, "p50_ns": self.percentile(50),
+                "p90_ns": self.percentile(90), "p99_ns": self.percentile(99)}
+
+
+def _fmt_ns(ns):
+    if ns >= 1e6:
+        return f"{ns / 1e6:.1f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.1f}µs"
+    return f"{ns:.0f}ns"
+
+
+class Profiler:
+    def __init__(self):
+        self.latency = {}   # nombre -> LatencyHistogram
+        self.counters = {}  # nombre -> entero
+        self._wrapped = []  # (objeto, nombre del método)
+
+    def histogram(self, name):
+        hist = self.latency.get(name)
+        if hist is None:
+            hist = self.latency[name] = LatencyHistogram()
+        return hist
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def instrument(self, obj, methods, prefix="", counter=None):
+        """Mide cada llamada a obj.<método>; con counter solo cuenta las llamadas en ese contador"""
+        clock = time.perf_counter_ns
+        for name in methods:
+            fn = getattr(obj, name)
+            if counter is not None:
+                @wraps(fn)
+                def counted(*args, _fn=fn, **kwargs):
+                    self.counters[counter] = self.counters.get(counter, 0) + 1
+                    return _fn(*args, **kwargs)
+                setattr(obj, name, counted)
+            else:
+                record = self.histogram(prefix + name).record
+
+                @wraps(fn)
+                def timed(*args, _fn=fn, _record=record, **kwargs):
+                    t = clock()
+                    try:
+                        return _fn(*args, **kwargs)
+                    finally:
+                        _record(clock() - t)
+                setattr(obj, name, timed)
+            self._wrapped.append((obj, name))
+
+    def uninstrument(self):
+        """Devuelve los métodos originales a todos los objetos instrumentados"""
+        for obj, name in reversed(self._wrapped):
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+        self._wrapped.clear()
+
+    def reset(self):
+        self.latency.clear()
+        self.counters.clear()
+
+    def top(self, n=4):
+        """Las n operaciones con más tiempo total, como texto corto"""
+        rows = sorted(self.latency.items(), key=lambda kv: kv[1].total, reverse=True)[:n]
+        return [f"{name} ×{h.count} p50 {_fmt_ns(h.percentile(50))} p99 {_fmt_ns(h.percentile(99))}"
+                for name, h in rows if h.count]
+
+    def report(self):
+        return {"latency": {name: h.summary() for name, h in sorted(self.latency.items()) if h.count},
+                "counters": dict(sorted(self.counters.items()))}
+
+    def export(self, path):
+        """Guarda el informe en JSON (con las cubetas) o en CSV según la extensión"""
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                fields = list(LatencyHistogram().summary())
+                writer.writerow(["name"] + fields)
+                for name, h in sorted(self.latency.items()):
+                    if not h.count:
+                        continue
+                    summary = h.summary()
+                    writer.writerow([name] + [summary[k] for k in fields])
+                for name, value in sorted(self.counters.items()):
+                    writer.writerow([name, value] + [""] * (len(fields) - 1))
+            return
+        report = self.report()
+        for name, summary in report["latency"].items():
+            summary["buckets"] = self.latency[name].buckets
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+
+
+# Métodos del administrador que se miden por defecto
+MANAGER_OPS = ("allocate", "first_fit", "next_fit", "best_fit", "worst_fit", "allocate_memory",
+               "deallocate_memory", "allocate_many", "free_many", "stats", "compact")
+
+
+def instrument_manager(profiler, manager, prefix=""):
+    profiler.instrument(manager, [m for m in MANAGER_OPS if hasattr(manager, m)], prefix)
@@ -0,0 +1,495 @@
+import heapq
+import random
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right, insort
+
+from compaction import CompactionResult, plan_compaction
+from history import ALLOC, COMPACT, FAIL, FREE, EventHistory
+from strategies import STRATEGIES
+
+# Instantánea de estadísticas; se desempaqueta igual que la tupla de antes
+MemoryStats = namedtuple("MemoryStats", "used free fragmentation largest")
+
+
+class FreeBlockIndex:
+    """Índice persistente de bloques libres.
+
+    Los inicios se guardan ordenados por dirección en cubetas de tamaño acotado:
+    sirve para localizar y fusionar vecinos. Un montículo de máximos por tamaño
+    (desempate por menor dirección) da el mayor bloque en O(log n). Bajo
+    demanda se mantienen además el mayor tamaño de cada cubeta, para que
+    primer/siguiente ajuste salten cubetas enteras, y una lista ordenada por
+    (tamaño, inicio) para mejor ajuste; peor ajuste no paga ninguno de los dos.
+    """
+
+    BUCKET = 128
+
+    def __init__(self, total_memory):
+        self._buckets = [[]]  # inicios ordenados, partidos en cubetas
+        self._heads = [0]     # primer inicio de cada cubeta (para bisect)
+        self._bmax = None     # mayor tamaño de cada cubeta, solo si se pidió con track_bucket_max
+        self._size = {}       # inicio -> tamaño
+        self._heap = []       # (-tamaño, inicio); las entradas obsoletas se descartan al consultar
+        self._by_size = None  # [(tamaño, inicio)] ordenada, solo si se pidió con track_size_order
+        if total_memory > 0:
+            self._insert(0, total_memory)
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """Construye el índice de una vez a partir de (start, size) ordenados por dirección"""
+        index = cls(0)
+        starts = [s for s, _ in blocks]
+        index._size = dict(blocks)
+        if starts:
+            index._buckets = [starts[i:i + cls.BUCKET] for i in range(0, len(starts), cls.BUCKET)]
+            index._heads = [b[0] for b in index._buckets]
+        index._heap = [(-l, s) for s, l in blocks]
+        heapq.heapify(index._heap)
+        return index
+
+    def __len__(self):
+        return len(self._size)
+
+    def _bucket_of(self, pos):
+        return max(0, bisect_right(self._heads, pos) - 1)
+
+    def _insert(self, start, size):
+        self._size[start] = size
+        b = self._bucket_of(start)
+        bucket = self._buckets[b]
+        insort(bucket, start)
+        self._heads[b] = bucket[0]
+        bmax = self._bmax
+        if bmax is not None and size > bmax[b]:
+            bmax[b] = size
+        if len(bucket) > 2 * self.BUCKET:
+            half = bucket[self.BUCKET:]
+            del bucket[self.BUCKET:]
+            self._buckets.insert(b + 1, half)
+            self._heads.insert(b + 1, half[0])
+            if bmax is not None:
+                bmax.insert(b + 1, 0)
+                self._refresh_max(b)
+                self._refresh_max(b + 1)
+        heapq.heappush(self._heap, (-size, start))
+        if self._by_size is not None:
+            insort(self._by_size, (size, start))
+
+    def _delete(self, start):
+        size = self._size.pop(start)
+        b = self._bucket_of(start)
+        bucket = self._buckets[b]
+        del bucket[bisect_left(bucket, start)]
+        bmax = self._bmax
+        if not bucket and len(self._buckets) > 1:
+            del self._buckets[b], self._heads[b]
+            if bmax is not None:
+                del bmax[b]
+        else:
+            if bucket:
+                self._heads[b] = bucket[0]
+            if bmax is not None and size == bmax[b]:
+                self._refresh_max(b)
+        if len(self._heap) > 2 * len(self._size) + 64:  # purgar entradas obsoletas
+            self._heap = [(-l, s) for s, l in self._size.items()]
+            heapq.heapify(self._heap)
+        if self._by_size is not None:
+            del self._by_size[bisect_left(self._by_size, (size, start))]
+
+    def _refresh_max(self, b):
+        size = self._size
+        self._bmax[b] = max((size[s] for s in self._buckets[b]), default=0)
+
+    def _predecessor(self, pos):
+        """Mayor inicio <= pos o None"""
+        bucket = self._buckets[self._bucket_of(pos)]
+        i = bisect_right(bucket, pos) - 1
+        return bucket[i] if i >= 0 else None
+
+    def blocks(self):
+        """Devuelve lista de (start, size) ordenada por dirección"""
+        size = self._size
+        return [(s, size[s]) for bucket in self._buckets for s in bucket]
+
+    def largest(self):
+        """Devuelve (start, size) del mayor bloque libre (el primero en caso de empate) o None"""
+        heap = self._heap
+        while heap:
+            neg, start = heap[0]
+            if self._size.get(start) == -neg:
+                return start, -neg
+            heapq.heappop(heap)
+        return None
+
+    def track_bucket_max(self):
+        """Empieza a mantener el mayor tamaño de cada cubeta que usa first_fit"""
+        if self._bmax is None:
+            self._bmax = []
+            for b in range(len(self._buckets)):
+                self._bmax.append(0)
+                self._refresh_max(b)
+
+    def first_fit(self, size, lo=0):
+        """Primer bloque con inicio >= lo donde cabe size, o None"""
+        sizes = self._size
+        for b in range(self._bucket_of(lo), len(self._buckets)):
+            if self._bmax[b] < size:
+                continue
+            bucket = self._buckets[b]
+            for i in range(bisect_left(bucket, lo), len(bucket)):
+                if sizes[bucket[i]] >= size:
+                    return bucket[i], sizes[bucket[i]]
+        return None
+
+    def track_size_order(self):
+        """Empieza a mantener la lista por (tamaño, inicio) que usa smallest_fitting"""
+        if self._by_size is None:
+            self._by_size = sorted((l, s) for s, l in self._size.items())
+
+    def smallest_fitting(self, size):
+        """Bloque más pequeño donde cabe size (el primero en caso de empate) o None"""
+        i = bisect_left(self._by_size, (size, -1))
+        return (self._by_size[i][1], self._by_size[i][0]) if i < len(self._by_size) else None
+
+    def containing(self, pos):
+        """Devuelve (start, size) del bloque libre que contiene pos o None"""
+        s = self._predecessor(pos)
+        if s is not None and pos < s + self._size[s]:
+            return s, self._size[s]
+        return None
+
+    def carve(self, start, size):
+        """Marca [start, start+size) como ocupado; debe estar dentro de un bloque libre"""
+        block = self.containing(start)
+        if block is None or start + size > block[0] + block[1]:
+            raise ValueError(f"Rango {start}+{size} no está libre")
+        s, l = block
+        self._delete(s)
+        if start > s:
+            self._insert(s, start - s)
+        end = start + size
+        if end < s + l:
+            self._insert(end, s + l - end)
+
+    def release(self, start, size):
+        """Devuelve [start, start+size) al índice fusionando con los vecinos libres"""
+        end = start + size
+        nxt = self._size.get(end)
+        if nxt is not None:
+            self._delete(end)
+            end += nxt
+        s = self._predecessor(start - 1) if start > 0 else None
+        if s is not None and s + self._size[s] == start:
+            self._delete(s)
+            start = s
+        self._insert(start, end - start)
+
+
+class ManagerMixin:
+    """Lista de activos, notificaciones y lotes comunes a los administradores
+    (MemoryManager, slabs, pools).
+
+    La clase define allocate() y deallocate_memory() e inicializa ``_active``,
+    ``_active_pos``, ``listeners`` y ``_batch = None``.
+    """
+
+    def _activate(self, name):
+        self._active_pos[name] = len(self._active)
+        self._active.append(name)
+
+    def _deactivate(self, name):
+        """Quita name de la lista de activos intercambiándolo con el último"""
+        pos = self._active_pos.pop(name)
+        last = self._active.pop()
+        if last != name:
+            self._active[pos] = last
+            self._active_pos[last] = pos
+
+    def active_processes(self):
+        """Devuelve los nombres de los procesos en memoria"""
+        return list(self._active)
+
+    def random_process(self, rng=random):
+        """Elige un proceso activo al azar en O(1); None si no hay ninguno"""
+        if not self._active:
+            return None
+        return self._active[rng.randrange(len(self._active))]
+
+    def add_listener(self, callback):
+        """Registra callback(changes); changes es una lista de (op, start, size, owner)
+        con op "alloc" o "free", emitida tras cada operación que modifica la memoria"""
+        self.listeners.append(callback)
+
+    def _notify(self, changes):
+        if self._batch is not None:
+            self._batch.extend(changes)
+            return
+        for callback in self.listeners:
+            callback(changes)
+
+    @contextmanager
+    def batch(self):
+        """Retiene las notificaciones del bloque y las emite juntas al salir (una sola
+        lista de cambios, un solo redibujo); los bloques anidados se suman al externo"""
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        finally:
+            changes, self._batch = self._batch, None
+            if changes:
+                self._notify(changes)
+
+    def allocate_many(self, sizes, names):
+        """Asigna sizes[i] a names[i] en orden con la estrategia seleccionada.
+
+        Cada elemento pasa por allocate() (así lo ve instrumentation.py) pero
+        con una sola notificación; devuelve los inicios (-1 donde no hubo lugar).
+        """
+        if len(sizes) != len(names):
+            raise ValueError("sizes y names deben tener el mismo largo")
+        allocate = self.allocate
+        with self.batch():
+            return [allocate(name, size) for name, size in zip(names, sizes)]
+
+    def free_many(self, names):
+        """Libera los procesos nombrados (los ausentes se ignoran) con una sola notificación"""
+        deallocate = self.deallocate_memory
+        with self.batch():
+            for name in names:
+                deallocate(name)
+
+
+class MemoryManager(ManagerMixin):
+    """Administrador de memoria contigua basado en tramos.
+
+    Las asignaciones se guardan como tramos (start, size, owner) ordenados por
+    dirección y los huecos en FreeBlockIndex, así que memoria y coste crecen con
+    el número de asignaciones y no con el de unidades. La vista celda a celda
+    solo se materializa cuando se pide (``memory`` / ``cells``). La política de
+    ubicación es intercambiable (ver strategies.py).
+    """
+
+    def __init__(self, total_memory=100, strategy="worst", history_size=1000, history_spill=None,
+                 auto_compact=False):
+        self.total_memory = total_memory
+        self.history = EventHistory(history_size, history_spill)
+        self.free_index = self._make_index(total_memory)
+        self.used = 0       # unidades asignadas, actualizado en cada operación
+        self._starts = []   # inicios de tramos asignados, ordenados
+        self._extents = {}  # inicio -> (size, owner)
+        self.processes = {}  # tabla de procesos: nombre -> (start, size)
+        self._active = []    # nombres activos, indexable para elegir víctima en O(1)
+        self._active_pos = {}
+        self.listeners = []  # callbacks que reciben [(op, start, size, owner), ...]
+        self._batch = None   # cambios retenidos dentro de batch()
+        self.auto_compact = auto_compact  # compactar cuando falla solo por fragmentación
+        self.compactions = 0      # coste acumulado de las compactaciones
+        self.compacted_units = 0
+        self.compact_time = 0.0
+        self._strategies = {}
+        self.set_strategy(strategy)
+
+    backend = "extents"  # nombre del modo en replay.make_manager
+
+    @property
+    def max_request(self):
+        """Mayor tamaño que podría asignarse con la memoria vacía"""
+        return self.total_memory
+
+    def _make_index(self, total_memory):
+        return FreeBlockIndex(total_memory)
+
+    def _restore(self, starts, sizes, names, active):
+        """Carga de una vez los tramos (listas paralelas ordenadas por dirección) y el
+        orden de la lista de activos, sin pasar por _place (ver snapshot.py)"""
+        self._starts = list(starts)
+        self._extents = dict(zip(starts, zip(sizes, names)))
+        self.processes = dict(zip(names, zip(starts, sizes)))
+        self._active = list(active)
+        self._active_pos = dict(zip(self._active, range(len(self._active))))
+        self.used = sum(sizes)
+        self._restore_index(starts, sizes)
+
+    def _restore_index(self, starts, sizes):
+        gaps, pos = [], 0
+        for s, l in zip(starts, sizes):
+            if s > pos:
+                gaps.append((pos, s - pos))
+            pos = s + l
+        if pos < self.total_memory:
+            gaps.append((pos, self.total_memory - pos))
+        self.free_index = FreeBlockIndex.from_blocks(gaps)
+        for strategy in self._strategies.values():
+            strategy.attach(self.free_index)
+
+    def _get_strategy(self, key):
+        strategy = self._strategies.get(key)
+        if strategy is None:
+            if key not in STRATEGIES:
+                raise ValueError(f"Estrategia desconocida: {key}")
+            strategy = self._strategies[key] = STRATEGIES[key]()
+            strategy.attach(self.free_index)
+        return strategy
+
+    def set_strategy(self, key):
+        """Selecciona la política que usa allocate(): first, next, best o worst"""
+        self.strategy = self._get_strategy(key)
+        self.history.label = self.strategy.label
+
+    @property
+    def memory(self):
+        """Vista celda a celda (None = libre); se construye en cada acceso"""
+        return self.cells(0, self.total_memory)
+
+    def cells(self, lo, hi):
+        """Materializa las celdas de [lo, hi) con el dueño de cada una"""
+        out = [None] * (hi - lo)
+        for start, size, owner in self.extents(lo, hi):
+            a, b = max(start, lo), min(start + size, hi)
+            out[a - lo:b - lo] = [owner] * (b - a)
+        return out
+
+    def extents(self, lo=0, hi=None):
+        """Devuelve los tramos (start, size, owner) que intersectan [lo, hi)"""
+        hi = self.total_memory if hi is None else hi
+        starts = self._starts
+        i = max(bisect_right(starts, lo) - 1, 0)
+        out = []
+        while i < len(starts) and starts[i] < hi:
+            start = starts[i]
+            size, owner = self._extents[start]
+            if start + size > lo:
+                out.append((start, size, owner))
+            i += 1
+        return out
+
+    def occupancy(self, lo, hi, columns):
+        """Fracción ocupada de cada una de las `columns` columnas iguales de [lo, hi)"""
+        width = (hi - lo) / columns
+        used = [0.0] * columns
+        for start, size, _ in self.extents(lo, hi):
+            a, b = max(start, lo), min(start + size, hi)
+            c = int((a - lo) / width)
+            while a < b and c < columns:  # repartir el tramo entre las columnas que toca
+                edge = min(b, lo + (c + 1) * width)
+                used[c] += edge - a
+                a = edge
+                c += 1
+        return [min(1.0, u / width) for u in used]
+
+    def _free_blocks(self):
+        """Devuelve lista de (start, size) de bloques libres"""
+        return self.free_index.blocks()
+
+    def allocate(self, process_name, size):
+        """Asigna con la estrategia seleccionada; devuelve el inicio o -1"""
+        return self._fit(self.strategy, process_name, size)
+
+    def _fit(self, strategy, process_name, size):
+        block = strategy.find(self.free_index, size)
+        if block is None and self.auto_compact and self.total_memory - self.used >= size > 0:
+            # Hay espacio total pero ningún hueco alcanza: compactar y reintentar
+            if self.compact().blocks:
+                block = strategy.find(self.free_index, size)
+        if block:
+            start = block[0]
+            self.allocate_memory(start, process_name, size)
+            strategy.placed(start, size)
+            self.history.record(ALLOC, process_name, size, start, block[1])
+            return start
+        self.history.record(FAIL, process_name, size)
+        return -1
+
+    def can_fit(self, size):
+        """True si allocate(size) encontraría hueco ahora (sin compactar ni registrar nada)"""
+        return self.strategy.find(self.free_index, size) is not None
+
+    def first_fit(self, process_name, size):
+        return self._fit(self._get_strategy("first"), process_name, size)
+
+    def next_fit(self, process_name, size):
+        return self._fit(self._get_strategy("next"), process_name, size)
+
+    def best_fit(self, process_name, size):
+        return self._fit(self._get_strategy("best"), process_name, size)
+
+    def worst_fit(self, process_name, size):
+        return self._fit(self._get_strategy("worst"), process_name, size)
+
+    def allocate_memory(self, start, process_name, size):
+        if process_name in self.processes:
+            raise ValueError(f"El proceso {process_name} ya está en memoria")
+        if size <= 0:
+            return
+        self._place(start, process_name, size)
+        self._notify([("alloc", start, size, process_name)])
+
+    def _place(self, start, process_name, size):
+        """Registra el tramo en el índice, los tramos y la tabla de procesos"""
+        self.free_index.carve(start, size)
+        insort(self._starts, start)
+        self._extents[start] = (size, process_name)
+        self.used += size
+        self.processes[process_name] = (start, size)
+        self._activate(process_name)
+
+    def _unplace(self, process_name):
+        """Deshace _place; devuelve (start, size) o None si el proceso no está"""
+        entry = self.processes.pop(process_name, None)
+        if entry is None:
+            return None
+        start, size = entry
+        self._deactivate(process_name)
+        del self._extents[start]
+        del self._starts[bisect_left(self._starts, start)]
+        self.free_index.release(start, size)
+        self.used -= size
+        return entry
+
+    def _release(self, process_name):
+        """Libera el tramo del proceso; devuelve True si estaba en memoria"""
+        entry = self._unplace(process_name)
+        if entry is None:
+            return False
+        self._notify([("free", entry[0], entry[1], process_name)])
+        return True
+
+    def compact(self):
+        """Junta los huecos en uno con el plan más barato de compaction.py.
+
+        Mueve tramos, no celdas; los listeners reciben un par ("free", "alloc")
+        por tramo movido en una sola notificación. Devuelve CompactionResult.
+        """
+        t0 = time.perf_counter()
+        moves = plan_compaction(self.extents(), self.total_memory)
+        changes = []
+        for owner, old, new, size in moves:
+            self._unplace(owner)
+            self._place(new, owner, size)
+            changes += [("free", old, size, owner), ("alloc", new, size, owner)]
+        result = CompactionResult(len(moves), sum(m[3] for m in moves), time.perf_counter() - t0)
+        if moves:
+            self.compactions += 1
+            self.compacted_units += result.units
+            self.compact_time += result.elapsed
+            self.history.record(COMPACT, "", result.units, -1, result.blocks)
+            self._notify(changes)
+        return result
+
+    def deallocate_memory(self, process_name):
+        """Libera el proceso; devuelve True si estaba en memoria"""
+        if self._release(process_name):
+            self.history.record(FREE, process_name)
+            return True
+        return False
+
+    def stats(self):
+        """Devuelve MemoryStats(used, free, fragmentation, largest) sin recorrer la memoria"""
+        largest = self.free_index.largest()
+        return MemoryStats(self.used, self.total_memory - self.used, len(self.free_index),
+                           largest[1] if largest else 0)
@@ -0,0 +1,136 @@
+"""Modo de MemoryManager respaldado por un arreglo NumPy de dueños.
+
+Requiere NumPy (dependencia opcional: solo se importa al pedir este modo).
+Cada celda guarda en un int32 el id del proceso dueño (0 = libre); los huecos
+se detectan con diff/flatnonzero sobre la máscara de ocupación y asignar o
+liberar es una asignación por rebanada. Las decisiones coinciden con las de
+MemoryManager porque la política y la tabla de procesos son las mismas.
+"""
+import numpy as np
+
+from memory_manager import MemoryManager, MemoryStats
+
+
+class OwnerArrayIndex:
+    """Adaptador con la interfaz de FreeBlockIndex sobre el arreglo de dueños"""
+
+    def __init__(self, owners):
+        self.owners = owners
+
+    def runs(self):
+        """Devuelve (inicios, tamaños) de los tramos libres como arreglos"""
+        free = np.concatenate(([0], (self.owners == 0).astype(np.int8), [0]))
+        edges = np.diff(free)
+        starts = np.flatnonzero(edges == 1)
+        return starts, np.flatnonzero(edges == -1) - starts
+
+    def __len__(self):
+        return len(self.runs()[0])
+
+    def blocks(self):
+        starts, sizes = self.runs()
+        return list(zip(starts.tolist(), sizes.tolist()))
+
+    def largest(self):
+        starts, sizes = self.runs()
+        if not len(starts):
+            return None
+        i = int(sizes.argmax())  # argmax devuelve el primero en caso de empate
+        return int(starts[i]), int(sizes[i])
+
+    def first_fit(self, size, lo=0):
+        starts, sizes = self.runs()
+        hits = np.flatnonzero((sizes >= size) & (starts >= lo))
+        return (int(starts[hits[0]]), int(sizes[hits[0]])) if len(hits) else None
+
+    def track_bucket_max(self):
+        pass  # no hay cubetas: first_fit filtra todos los tramos
+
+    def track_size_order(self):
+        pass  # el orden por tamaño se calcula en cada consulta
+
+    def smallest_fitting(self, size):
+        starts, sizes = self.runs()
+        hits = np.flatnonzero(sizes >= size)
+        if not len(hits):
+            return None
+        i = hits[sizes[hits].argmin()]  # argmin devuelve el de menor dirección en empate
+        return int(starts[i]), int(sizes[i])
+
+    def containing(self, pos):
+        owners = self.owners
+        if not 0 <= pos < len(owners) or owners[pos]:
+            return None
+        used_left = np.flatnonzero(owners[:pos])
+        used_right = np.flatnonzero(owners[pos:])
+        start = int(used_left[-1]) + 1 if len(used_left) else 0
+        end = pos + int(used_right[0]) if len(used_right) else len(owners)
+        return start, end - start
+
+    def carve(self, start, size):
+        if start < 0 or start + size > len(self.owners) or self.owners[start:start + size].any():
+            raise ValueError(f"Rango {start}+{size} no está libre")
+
+    def release(self, start, size):
+        self.owners[start:start + size] = 0
+
+
+class ArrayMemoryManager(MemoryManager):
+    """MemoryManager que guarda un id de dueño por celda en un arreglo NumPy"""
+
+    backend = "numpy"
+
+    def __init__(self, total_memory=100, strategy="worst", **kwargs):
+        super().__init__(total_memory, strategy, **kwargs)
+        self._ids = {}     # nombre -> id
+        self._names = {}   # id -> nombre
+        self._next_id = 1
+        self._free_ids = []  # ids de procesos liberados, se reutilizan para no desbordar int32
+
+    def _make_index(self, total_memory):
+        self.owners = np.zeros(total_memory, dtype=np.int32)
+        return OwnerArrayIndex(self.owners)
+
+    def _restore_index(self, starts, sizes):
+        # Ids nuevos 1..n en orden de dirección; el arreglo se llena con diferencias acumuladas
+        n = len(starts)
+        ids = np.arange(1, n + 1, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        delta = np.zeros(self.total_memory + 1, dtype=np.int64)
+        delta[starts] += ids
+        delta[starts + np.asarray(sizes, dtype=np.int64)] -= ids
+        self.owners[:] = np.cumsum(delta[:-1])
+        names = [self._extents[s][1] for s in self._starts]
+        self._names = dict(zip(range(1, n + 1), names))
+        self._ids = dict(zip(names, range(1, n + 1)))
+        self._next_id = n + 1
+        self._free_ids = []
+
+    def cells(self, lo, hi):
+        names = self._names
+        return [names.get(i) for i in self.owners[lo:hi].tolist()]
+
+    def _place(self, start, process_name, size):
+        super()._place(start, process_name, size)
+        if self._free_ids:
+            pid = self._free_ids.pop()
+        else:
+            pid = self._next_id
+            self._next_id += 1
+        self._ids[process_name] = pid
+        self._names[pid] = process_name
+        self.owners[start:start + size] = pid
+
+    def _unplace(self, process_name):
+        entry = super()._unplace(process_name)
+        if entry is not None:
+            pid = self._ids.pop(process_name)
+            del self._names[pid]
+            self._free_ids.append(pid)
+        return entry
+
+    def stats(self):
+        # Una sola pasada vectorizada para contar y medir los huecos
+        starts, sizes = self.free_index.runs()
+        return MemoryStats(self.used, self.total_memory - self.used, len(starts),
+                           int(sizes.max()) if len(sizes) else 0)
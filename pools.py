@@ -0,0 +1,251 @@
+"""Memoria en varios pools (niveles tipo NUMA: rápida y chica, lenta y grande...).
+
+Cada pool es un MemoryManager propio (con su estrategia e índice de huecos)
+sobre un tramo contiguo del espacio de direcciones: los pools se apilan en el
+orden declarado, así que los tramos y la vista siguen usando direcciones
+globales. Una política de ubicación decide en qué orden se prueban los pools
+para cada petición; si el preferido está lleno se derrama al siguiente
+(``spill=False`` lo impide).
+
+Políticas (PLACEMENTS):
+    tier      en el orden declarado: el primer pool con lugar
+    size      primero los pools cuyo ``max_size`` admite el tamaño
+    affinity  primero el pool pedido en allocate(..., pool=nombre)
+
+Por pool se lleva la latencia de asignación medida (histograma de
+instrumentation.py), asignaciones propias y derramadas, fallos, y un coste
+relativo de acceso para comparar configuraciones por el coste medio de las
+unidades ocupadas.
+
+Uso:
+    python replay.py traza.bin --pools rapida:200:8:1 lenta:800::4 --placement size
+"""
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+from compaction import CompactionResult
+from history import ALLOC, COMPACT, FAIL, FREE, EventHistory, format_event
+from instrumentation import LatencyHistogram
+from memory_manager import ManagerMixin, MemoryManager, MemoryStats
+from replay import make_manager
+
+# Estadísticas de un pool: las de MemoryStats más contadores de ubicación
+PoolStats = namedtuple("PoolStats", "name base size used free fragmentation largest allocated spilled failed "
+                                    "cost p50_ns p99_ns")
+
+
+class Pool:
+    __slots__ = ("name", "manager", "base", "max_size", "cost", "allocated", "spilled", "failed", "latency")
+
+    def __init__(self, name, manager, base, max_size=None, cost=1.0):
+        self.name = name
+        self.manager = manager
+        self.base = base
+        self.max_size = max_size  # mayor petición que prefiere (None = cualquiera)
+        self.cost = cost          # coste relativo de acceso por unidad
+        self.allocated = self.spilled = self.failed = 0
+        self.latency = LatencyHistogram()
+
+
+class TierPlacement:
+    key, label = "tier", "Por nivel"
+
+    def order(self, pools, size, hint):
+        return range(len(pools))
+
+
+class SizeClassPlacement:
+    key, label = "size", "Por tamaño"
+
+    def order(self, pools, size, hint):
+        fits = [i for i, p in enumerate(pools) if p.max_size is None or size <= p.max_size]
+        return fits + [i for i, p in enumerate(pools) if i not in fits]
+
+
+class AffinityPlacement:
+    key, label = "affinity", "Por afinidad"
+
+    def order(self, pools, size, hint):
+        first = [i for i, p in enumerate(pools) if p.name == hint]
+        return first + [i for i in range(len(pools)) if i not in first]
+
+
+PLACEMENTS = {cls.key: cls for cls in (TierPlacement, SizeClassPlacement, AffinityPlacement)}
+
+
+def parse_pools(specs):
+    """'nombre:tamaño[:max_size[:coste]]' -> lista de (nombre, tamaño, max_size, coste)"""
+    out = []
+    for spec in specs:
+        name, size, max_size, cost = (spec.split(":") + ["", ""])[:4]
+        out.append((name, int(size), int(max_size) if max_size else None, float(cost) if cost else 1.0))
+    return out
+
+
+class PooledMemoryManager(ManagerMixin):
+    """Expone la interfaz de MemoryManager sobre varios pools; pools es una lista de
+    (nombre, tamaño[, max_size[, coste]]) y kwargs van a make_manager de cada pool"""
+
+    # Vistas de celdas y columnas sobre los tramos globales de extents()
+    cells = MemoryManager.cells
+    occupancy = MemoryManager.occupancy
+    memory = MemoryManager.memory
+
+    def __init__(self, pools, placement="tier", strategy="worst", spill=True, backend="extents",
+                 history_size=1000, history_spill=None, **kwargs):
+        self.pools = []
+        base = 0
+        for name, size, *rest in pools:
+            max_size = rest[0] if rest else None
+            cost = rest[1] if len(rest) > 1 else 1.0
+            manager = make_manager(size, backend, strategy, history_size=0, **kwargs)
+            manager.add_listener(lambda changes, base=base: self._notify(
+                [(op, base + start, length, owner) for op, start, length, owner in changes]))
+            manager.history.listeners.append(self._on_pool_event)
+            self.pools.append(Pool(name, manager, base, max_size, cost))
+            base += size
+        self._bases = [p.base for p in self.pools]
+        self.total_memory = base
+        self.placement = PLACEMENTS[placement]()
+        self.spill = spill
+        self.history = EventHistory(history_size, history_spill, self._format)
+        self.history.label = self.strategy.label
+        self._where = {}   # nombre -> índice del pool
+        self._active = []  # nombres activos, para elegir víctima en O(1)
+        self._active_pos = {}
+        self.listeners = []
+        self._batch = None
+
+    def _on_pool_event(self, op, pid, size, start, block):
+        # Las compactaciones (también las automáticas) se registran en el pool: se copian aquí
+        if op == COMPACT:
+            self.history.record(COMPACT, pid, size, start, block)
+
+    def _format(self, event, label):
+        op, pid, size, start = event[:4]
+        if op == ALLOC:
+            pool = self.pools[bisect_right(self._bases, start) - 1]
+            return f"Asignado {pid} (tamaño {size}) en {start} - {label} en {pool.name}"
+        return format_event(event, label)
+
+    strategy = property(lambda self: self.pools[0].manager.strategy)
+    used = property(lambda self: sum(p.manager.used for p in self.pools))
+    max_request = property(lambda self: max(p.manager.max_request for p in self.pools))
+    compactions = property(lambda self: sum(p.manager.compactions for p in self.pools))
+    compacted_units = property(lambda self: sum(p.manager.compacted_units for p in self.pools))
+    compact_time = property(lambda self: sum(p.manager.compact_time for p in self.pools))
+
+    @property
+    def processes(self):
+        """nombre -> (start, size) con direcciones globales; se construye en cada acceso"""
+        out = {}
+        for p in self.pools:
+            out.update((name, (p.base + s, l)) for name, (s, l) in p.manager.processes.items())
+        return out
+
+    def set_strategy(self, key):
+        for p in self.pools:
+            p.manager.set_strategy(key)
+        self.history.label = self.strategy.label
+
+    def _track(self, name, i):
+        self._where[name] = i
+        self._activate(name)
+
+    def _untrack(self, name):
+        self._deactivate(name)
+        return self._where.pop(name)
+
+    def allocate(self, process_name, size, pool=None):
+        """Asigna en el primer pool con lugar según la política (pool = afinidad pedida);
+        devuelve el inicio global o -1"""
+        if process_name in self._where:
+            raise ValueError(f"El proceso {process_name} ya está en memoria")
+        pools = self.pools
+        order = self.placement.order(pools, size, pool)
+        clock = time.perf_counter_ns
+        for n, i in enumerate(order if self.spill else order[:1]):
+            p = pools[i]
+            t = clock()
+            start = p.manager.allocate(process_name, size)
+            p.latency.record(clock() - t)
+            if start != -1:
+                p.allocated += 1
+                if n:
+                    p.spilled += 1
+                self._track(process_name, i)
+                self.history.record(ALLOC, process_name, size, p.base + start)
+                return p.base + start
+        if order:
+            pools[order[0]].failed += 1
+        self.history.record(FAIL, process_name, size)
+        return -1
+
+    def can_fit(self, size, pool=None):
+        order = self.placement.order(self.pools, size, pool)
+        return any(self.pools[i].manager.can_fit(size) for i in (order if self.spill else order[:1]))
+
+    def deallocate_memory(self, process_name):
+        if process_name not in self._where:
+            return False
+        i = self._untrack(process_name)
+        self.pools[i].manager.deallocate_memory(process_name)
+        self.history.record(FREE, process_name)
+        return True
+
+    def _place(self, start, process_name, size):
+        """Como MemoryManager._place con dirección global (ver timeline.py)"""
+        i = bisect_right(self._bases, start) - 1
+        p = self.pools[i]
+        p.manager._place(start - p.base, process_name, size)
+        self._track(process_name, i)
+
+    def _unplace(self, process_name):
+        if process_name not in self._where:
+            return None
+        p = self.pools[self._untrack(process_name)]
+        start, size = p.manager._unplace(process_name)
+        return p.base + start, size
+
+    def compact(self):
+        """Compacta cada pool por separado; los tramos no cambian de pool"""
+        with self.batch():  # un solo paso en la línea de tiempo
+            results = [p.manager.compact() for p in self.pools]
+        return CompactionResult(sum(r.blocks for r in results), sum(r.units for r in results),
+                                sum(r.elapsed for r in results))
+
+    def extents(self, lo=0, hi=None):
+        """Tramos (start, size, owner) con direcciones globales que intersectan [lo, hi)"""
+        hi = self.total_memory if hi is None else hi
+        out = []
+        for p in self.pools:
+            top = p.base + p.manager.total_memory
+            if p.base < hi and top > lo:
+                out += [(p.base + s, l, o) for s, l, o in p.manager.extents(max(0, lo - p.base), min(hi, top) - p.base)]
+        return out
+
+    def pool_ranges(self):
+        """(nombre, base, tamaño) de cada pool, en orden de dirección"""
+        return [(p.name, p.base, p.manager.total_memory) for p in self.pools]
+
+    def stats(self):
+        """MemoryStats sumando los pools; el mayor hueco es el mayor de un solo pool"""
+        parts = [p.manager.stats() for p in self.pools]
+        used = sum(s.used for s in parts)
+        return MemoryStats(used, self.total_memory - used, sum(s.fragmentation for s in parts),
+                           max(s.largest for s in parts))
+
+    def pool_stats(self):
+        out = []
+        for p in self.pools:
+            st = p.manager.stats()
+            out.append(PoolStats(p.name, p.base, p.manager.total_memory, st.used, st.free, st.fragmentation,
+                                 st.largest, p.allocated, p.spilled, p.failed, p.cost,
+                                 p.latency.percentile(50), p.latency.percentile(99)))
+        return out
+
+    def mean_cost(self):
+        """Coste de acceso medio de las unidades ocupadas (pesado por unidades)"""
+        used = self.used
+        return sum(p.manager.used * p.cost for p in self.pools) / used if used else 0.0
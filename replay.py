@@ -0,0 +1,221 @@
+"""Reproducción de trazas de asignación sin interfaz gráfica.
+
+Formato texto (una operación por línea, '#' inicia un comentario):
+    a P1 12     asigna 12 unidades al proceso P1
+    f P1        libera el proceso P1
+
+Formato binario: la cabecera MAGIC seguida de registros '<BII'
+(op, pid, size) con op 0 = asignar y 1 = liberar; el proceso se llama P<pid>.
+
+Uso:
+    python replay.py traza.txt --memory 1000000
+    python replay.py traza.txt --convert traza.bin
+    python replay.py traza.bin --memory 1000000 --backend numpy
+    python replay.py parte1.bin --memory 1000000 --save estado.snap
+    python replay.py parte2.bin --resume estado.snap
+    python replay.py traza.bin --pools rapida:200000:64 lenta:800000 --placement size
+    python replay.py traza.bin --memory 1000000 --series serie.csv --series-every 1000
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+
+from memory_manager import MemoryManager
+from strategies import STRATEGIES
+
+MAGIC = b"MTRACE1\n"
+RECORD = struct.Struct("<BII")
+ALLOC, FREE = 0, 1
+CHUNK_RECORDS = 65536
+
+
+def read_text(f):
+    """Genera (op, nombre, tamaño) desde una traza de texto"""
+    for lineno, line in enumerate(f, 1):
+        line = line.split("#", 1)[0].split()
+        if not line:
+            continue
+        op = line[0].lower()
+        if op in ("a", "alloc") and len(line) == 3:
+            yield ALLOC, line[1], int(line[2])
+        elif op in ("f", "free") and len(line) == 2:
+            yield FREE, line[1], 0
+        else:
+            raise ValueError(f"Línea {lineno}: evento inválido {' '.join(line)!r}")
+
+
+def read_binary(f):
+    """Genera (op, nombre, tamaño) desde una traza binaria leyendo por bloques"""
+    size = RECORD.size * CHUNK_RECORDS
+    rest = b""
+    while True:
+        data = f.read(size)
+        if not data:
+            break
+        data = rest + data
+        cut = len(data) - len(data) % RECORD.size
+        rest = data[cut:]
+        for op, pid, n in RECORD.iter_unpack(data[:cut]):
+            yield op, f"P{pid}", n
+    if rest:
+        raise ValueError("Traza binaria truncada")
+
+
+def open_trace(path):
+    """Abre una traza detectando el formato por la cabecera"""
+    f = open(path, "rb")
+    if f.read(len(MAGIC)) == MAGIC:
+        return f, read_binary(f)
+    f.close()
+    f = open(path, encoding="utf-8")
+    return f, read_text(f)
+
+
+def write_binary(events, f):
+    """Escribe eventos en formato binario; los nombres deben ser P<entero>"""
+    f.write(MAGIC)
+    buf = []
+    for op, name, size in events:
+        if not (name[:1] == "P" and name[1:].isdigit()):
+            raise ValueError(f"Nombre {name!r} no representable en formato binario")
+        buf.append(RECORD.pack(op, int(name[1:]), size))
+        if len(buf) >= CHUNK_RECORDS:
+            f.write(b"".join(buf)); buf.clear()
+    f.write(b"".join(buf))
+
+
+def make_manager(total_memory, backend="extents", strategy="worst", **kwargs):
+    """Crea el administrador para el backend y la estrategia pedidos"""
+    if strategy == "buddy":
+        from buddy import BuddyMemoryManager
+        return BuddyMemoryManager(total_memory, **kwargs)
+    if backend == "numpy":
+        from numpy_manager import ArrayMemoryManager
+        return ArrayMemoryManager(total_memory, strategy, **kwargs)
+    return MemoryManager(total_memory, strategy, **kwargs)
+
+
+def replay(events, manager):
+    """Pasa los eventos por el administrador a máxima velocidad y devuelve el resumen.
+
+    Asignar un nombre que sigue en memoria no detiene la reproducción: se cuenta
+    en ``duplicates`` y se guarda el número del primero (desde 0). Liberar un
+    nombre que no está se cuenta en ``stray_frees``, no en ``freed``.
+    """
+    allocated = failed = freed = duplicates = stray = 0
+    first_duplicate = None
+    allocate, deallocate = manager.allocate, manager.deallocate_memory
+    t0 = time.perf_counter()
+    for op, name, size in events:
+        if op == ALLOC:
+            try:
+                start = allocate(name, size)
+            except ValueError:
+                if first_duplicate is None:
+                    first_duplicate = allocated + failed + freed + duplicates + stray
+                duplicates += 1
+                continue
+            if start == -1:
+                failed += 1
+            else:
+                allocated += 1
+        elif deallocate(name):
+            freed += 1
+        else:
+            stray += 1
+    elapsed = time.perf_counter() - t0
+    events_total = allocated + failed + freed + duplicates + stray
+    return {
+        "events": events_total, "allocated": allocated, "failed": failed, "freed": freed,
+        "duplicates": duplicates, "first_duplicate": first_duplicate, "stray_frees": stray,
+        "elapsed": elapsed, "ops_per_sec": events_total / elapsed if elapsed else 0.0,
+        "strategy": manager.strategy.key, "total_memory": manager.total_memory, **manager.stats()._asdict(),
+        "compactions": manager.compactions, "compacted_units": manager.compacted_units,
+        "compact_time": manager.compact_time,
+    }
+
+
+def format_report(r):
+    return (f"Estrategia: {r['strategy']}\n"
+            f"Eventos: {r['events']} ({r['ops_per_sec']:,.0f} ops/s en {r['elapsed']:.3f} s)\n"
+            f"Asignados: {r['allocated']} | Fallidos: {r['failed']} | Liberados: {r['freed']}"
+            + (f" | Duplicados: {r['duplicates']} (el primero en el evento {r['first_duplicate']})"
+               if r["duplicates"] else "")
+            + (f" | Liberaciones sin proceso: {r['stray_frees']}" if r["stray_frees"] else "") + "\n"
+            f"Usado: {r['used']}/{r['total_memory']} | Fragmentación: {r['fragmentation']} | Mayor: {r['largest']}\n"
+            f"Compactaciones: {r['compactions']} ({r['compacted_units']} unidades movidas en {r['compact_time']:.3f} s)"
+            + "".join(f"\nPool {p['name']}: {p['used']}/{p['size']} | Fragmentación: {p['fragmentation']} | "
+                      f"Mayor: {p['largest']} | Asignados: {p['allocated']} ({p['spilled']} derramados) | "
+                      f"Fallidos: {p['failed']} | p50 {p['p50_ns']} ns p99 {p['p99_ns']} ns"
+                      for p in r.get("pools", ()))
+            + (f"\nCoste medio de acceso: {r['mean_cost']:.2f}" if "pools" in r else ""))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Reproduce una traza de asignaciones sin GUI")
+    ap.add_argument("trace", help="traza de texto o binaria")
+    ap.add_argument("--memory", type=int, default=1000, help="tamaño total de memoria")
+    ap.add_argument("--backend", choices=("extents", "numpy"), default="extents",
+                    help="representación de la memoria (numpy requiere NumPy)")
+    ap.add_argument("--strategy", choices=sorted(STRATEGIES) + ["buddy"], default="worst",
+                    help="política de ubicación (buddy usa el sistema de compañeros)")
+    ap.add_argument("--pools", nargs="+", metavar="NOMBRE:TAMAÑO[:MAX[:COSTE]]",
+                    help="reparte la memoria en pools (ignora --memory, ver pools.py)")
+    ap.add_argument("--placement", choices=("tier", "size", "affinity"), default="tier",
+                    help="política que elige el pool de cada petición")
+    ap.add_argument("--auto-compact", action="store_true", help="compacta cuando una petición falla por fragmentación")
+    ap.add_argument("--resume", metavar="SNAP", help="parte del estado guardado en una instantánea")
+    ap.add_argument("--save", metavar="SNAP", help="guarda el estado final en una instantánea")
+    ap.add_argument("--profile", metavar="SALIDA", help="mide la latencia de cada operación y la guarda (.json o .csv)")
+    ap.add_argument("--series", metavar="SALIDA",
+                    help="guarda la serie de fragmentación (.csv o binario columnar, ver timeseries.py)")
+    ap.add_argument("--series-every", type=int, default=1, metavar="N", help="una muestra cada N operaciones")
+    ap.add_argument("--convert", metavar="SALIDA", help="convierte la traza a binario en lugar de reproducirla")
+    ap.add_argument("--json", action="store_true", help="imprime el resumen en JSON")
+    args = ap.parse_args(argv)
+    if args.pools and (args.save or args.resume):
+        ap.error("--pools no admite instantáneas (--save/--resume)")
+    if args.series_every < 1:
+        ap.error("--series-every debe ser al menos 1")
+
+    f, events = open_trace(args.trace)
+    with f:
+        if args.convert:
+            with open(args.convert, "wb") as out:
+                write_binary(events, out)
+            return 0
+        if args.resume:
+            import snapshot
+            manager = snapshot.load(args.resume)
+        elif args.pools:
+            from pools import PooledMemoryManager, parse_pools
+            manager = PooledMemoryManager(parse_pools(args.pools), args.placement, args.strategy,
+                                          backend=args.backend, auto_compact=args.auto_compact)
+        else:
+            manager = make_manager(args.memory, args.backend, args.strategy, auto_compact=args.auto_compact)
+        if args.profile:
+            from instrumentation import Profiler, instrument_manager
+            profiler = Profiler()
+            instrument_manager(profiler, manager)
+        if args.series:
+            from timeseries import SeriesRecorder, open_writer
+            recorder = SeriesRecorder(manager, open_writer(args.series), args.series_every)
+        report = replay(events, manager)
+        if args.profile:
+            profiler.export(args.profile)
+        if args.series:
+            recorder.close()
+    if args.save:
+        import snapshot
+        snapshot.save(manager, args.save)
+    if args.pools:
+        report["pools"] = [p._asdict() for p in manager.pool_stats()]
+        report["mean_cost"] = manager.mean_cost()
+    print(json.dumps(report) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
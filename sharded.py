@@ -0,0 +1,226 @@
+"""Administrador concurrente: la memoria repartida en arenas con su propio lock.
+
+Cada arena es un MemoryManager independiente (con su índice de huecos) sobre
+un tramo contiguo de direcciones, protegido por su lock. Cada hilo se asigna
+a una arena en su primera petición (round-robin) y pide siempre en ella; si
+ahí no cabe, roba espacio de las demás en orden. Un proceso se libera en la
+arena donde quedó, desde cualquier hilo. Con ``arenas=1`` es el caso de un
+único lock global, la referencia para medir.
+
+Contadores por arena: adquisiciones del lock, las que tuvieron que esperar
+(y cuánto), asignaciones robadas por hilos de otras arenas y fallos. Cada
+contador se actualiza con el lock de su arena tomado.
+
+Los huecos no cruzan el borde entre arenas y una petición mayor que una
+arena no cabe nunca. En CPython con GIL los hilos no corren en paralelo: la
+medición muestra el coste de sincronización y la contención, no aceleración.
+
+Uso:
+    python sharded.py --threads 1 2 4 8 --arenas 1 8 --ops 100000 --memory 100000
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from memory_manager import MemoryStats
+from replay import make_manager
+from strategies import STRATEGIES
+from workload import size_sampler
+
+# Contadores de una arena en un instante
+ArenaStats = namedtuple("ArenaStats", "base size used acquired contended wait_ns stolen failed")
+
+
+class Arena:
+    __slots__ = ("manager", "base", "lock", "acquired", "contended", "wait_ns", "stolen", "failed")
+
+    def __init__(self, manager, base):
+        self.manager = manager
+        self.base = base
+        self.lock = threading.Lock()
+        self.acquired = self.contended = self.wait_ns = self.stolen = self.failed = 0
+
+    def acquire(self):
+        lock = self.lock
+        if not lock.acquire(False):
+            t = time.perf_counter_ns()
+            lock.acquire()
+            self.contended += 1
+            self.wait_ns += time.perf_counter_ns() - t
+        self.acquired += 1
+
+
+class ShardedMemoryManager:
+    """Reparte total_memory en ``arenas`` arenas; kwargs van a make_manager de cada una"""
+
+    def __init__(self, total_memory=100, arenas=4, strategy="worst", steal=True, backend="extents", **kwargs):
+        kwargs.setdefault("history_size", 0)
+        self.total_memory = total_memory
+        self.steal = steal
+        self.arenas = []
+        base = 0
+        for i in range(arenas):
+            size = total_memory // arenas + (i < total_memory % arenas)
+            self.arenas.append(Arena(make_manager(size, backend, strategy, **kwargs), base))
+            base += size
+        self._where = {}  # nombre -> arena donde está
+        self._local = threading.local()
+        self._next_home = itertools.count()
+
+    def home(self):
+        """Índice de la arena del hilo actual (se fija en su primera petición)"""
+        local = self._local
+        try:
+            return local.home
+        except AttributeError:
+            local.home = next(self._next_home) % len(self.arenas)
+            return local.home
+
+    def allocate(self, process_name, size):
+        """Asigna en la arena del hilo o, si no cabe, en otra; devuelve el inicio global o -1.
+
+        Los nombres deben ser únicos entre todos los hilos.
+        """
+        if process_name in self._where:
+            raise ValueError(f"El proceso {process_name} ya está en memoria")
+        arenas = self.arenas
+        home = self.home()
+        order = range(home, home + len(arenas)) if self.steal else (home,)
+        for i in order:
+            arena = arenas[i % len(arenas)]
+            arena.acquire()
+            try:
+                start = arena.manager.allocate(process_name, size)
+                if start != -1:
+                    self._where[process_name] = arena
+                    if i != home:
+                        arena.stolen += 1
+                    return arena.base + start
+                if i == order[-1]:
+                    arena.failed += 1
+            finally:
+                arena.lock.release()
+        return -1
+
+    def deallocate_memory(self, process_name):
+        arena = self._where.pop(process_name, None)
+        if arena is None:
+            return False
+        arena.acquire()
+        try:
+            return arena.manager.deallocate_memory(process_name)
+        finally:
+            arena.lock.release()
+
+    def _locked(self, fn):
+        """Ejecuta fn(arena) en cada arena con todos los locks tomados (vista consistente)"""
+        for arena in self.arenas:
+            arena.lock.acquire()
+        try:
+            return [fn(arena) for arena in self.arenas]
+        finally:
+            for arena in reversed(self.arenas):
+                arena.lock.release()
+
+    def stats(self):
+        """MemoryStats sumando las arenas; el mayor hueco es el mayor de una sola arena"""
+        parts = self._locked(lambda a: a.manager.stats())
+        used = sum(p.used for p in parts)
+        return MemoryStats(used, self.total_memory - used, sum(p.fragmentation for p in parts),
+                           max(p.largest for p in parts))
+
+    def extents(self):
+        """Tramos (start, size, owner) con direcciones globales, en orden"""
+        parts = self._locked(lambda a: [(a.base + s, l, o) for s, l, o in a.manager.extents()])
+        return [e for part in parts for e in part]
+
+    def arena_stats(self):
+        return self._locked(lambda a: ArenaStats(a.base, a.manager.total_memory, a.manager.used, a.acquired,
+                                                 a.contended, a.wait_ns, a.stolen, a.failed))
+
+    def contention(self):
+        """Totales de los contadores de todas las arenas"""
+        rows = self.arena_stats()
+        acquired = sum(r.acquired for r in rows)
+        contended = sum(r.contended for r in rows)
+        return {"acquired": acquired, "contended": contended,
+                "contended_ratio": contended / acquired if acquired else 0.0,
+                "wait_ms": sum(r.wait_ns for r in rows) / 1e6, "stolen": sum(r.stolen for r in rows),
+                "failed": sum(r.failed for r in rows)}
+
+
+def _worker(manager, tid, ops, sizes, free_rate, seed, barrier, counts):
+    rng = random.Random(seed * 1_000_003 + tid)
+    sample = size_sampler(sizes, rng)
+    live = []
+    allocate, deallocate = manager.allocate, manager.deallocate_memory
+    done = 0
+    barrier.wait()
+    for i in range(ops):
+        if live and rng.random() < free_rate:
+            j = rng.randrange(len(live))
+            live[j], live[-1] = live[-1], live[j]
+            deallocate(live.pop())
+        else:
+            name = f"T{tid}-{i}"
+            if allocate(name, sample()) != -1:
+                live.append(name)
+                done += 1
+    counts[tid] = done
+
+
+def stress(memory, arenas, threads, ops, sizes="uniform:1-20", free_rate=0.4, strategy="worst", steal=True,
+           seed=0):
+    """Corre ``threads`` hilos con ``ops`` operaciones cada uno y devuelve la fila de resultados"""
+    manager = ShardedMemoryManager(memory, arenas, strategy, steal)
+    barrier = threading.Barrier(threads + 1)
+    counts = [0] * threads
+    pool = [threading.Thread(target=_worker, args=(manager, t, ops, sizes, free_rate, seed, barrier, counts))
+            for t in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    st = manager.stats()
+    return {"arenas": arenas, "threads": threads, "ops": ops * threads, "elapsed": elapsed,
+            "ops_per_sec": ops * threads / elapsed if elapsed else 0.0, "allocated": sum(counts),
+            "used": st.used, "fragmentation": st.fragmentation, **manager.contention()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Prueba de carga concurrente: arenas contra un lock global")
+    ap.add_argument("--memory", type=int, default=100000)
+    ap.add_argument("--arenas", type=int, nargs="+", default=[1, 8], help="1 = un único lock global")
+    ap.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--ops", type=int, default=50000, help="operaciones por hilo")
+    ap.add_argument("--sizes", default="uniform:1-20", help="distribución de tamaños (ver workload.py)")
+    ap.add_argument("--free-rate", type=float, default=0.4)
+    ap.add_argument("--strategy", choices=sorted(STRATEGIES), default="worst")
+    ap.add_argument("--no-steal", action="store_true", help="sin robo entre arenas")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="una fila JSON por corrida")
+    args = ap.parse_args(argv)
+
+    for arenas in args.arenas:
+        for threads in args.threads:
+            row = stress(args.memory, arenas, threads, args.ops, args.sizes, args.free_rate, args.strategy,
+                         not args.no_steal, args.seed)
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print(f"Arenas: {arenas:3} | Hilos: {threads:3} | {row['ops_per_sec']:12,.0f} ops/s | "
+                      f"Esperas: {row['contended']} ({row['contended_ratio'] * 100:.1f}%, {row['wait_ms']:.1f} ms) | "
+                      f"Robos: {row['stolen']} | Fallos: {row['failed']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
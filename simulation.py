@@ -0,0 +1,175 @@
+"""Simulación de eventos discretos sobre un administrador de memoria.
+
+Cada proceso llega en un instante, ocupa memoria durante su duración y se
+libera solo. Los eventos pendientes están en un montículo ordenado por
+tiempo y el reloj salta de uno al siguiente, así que la simulación corre tan
+rápido como la CPU permita. Las llegadas se toman de a una de un iterable
+(p. ej. ``workload.arrivals``): en el montículo solo hay las salidas de los
+procesos vivos y la próxima llegada.
+
+Una petición que no cabe espera en una cola FIFO y se reintenta cada vez
+que se libera memoria; sin cola (``wait=False``) se rechaza. Una petición
+mayor que lo que el administrador podría dar con la memoria vacía
+(``max_request``) se rechaza siempre: en la cola bloquearía a todas las demás.
+
+Uso:
+    python simulation.py --sizes exp:8 --lifetimes exp:100 --rate 1 --events 100000 --memory 1000
+    python simulation.py --events 100000 --sample 50 --series serie.csv
+"""
+import argparse
+import csv
+import heapq
+import json
+import sys
+import time
+from collections import deque, namedtuple
+
+DEPARTURE, ARRIVAL = 0, 1  # a igual tiempo se libera antes de asignar
+
+# Muestra periódica: instante, fracción de memoria usada y procesos en espera
+Sample = namedtuple("Sample", "time utilization queue")
+
+
+class Simulation:
+    def __init__(self, manager, arrivals, wait=True, sample_interval=None):
+        self.manager = manager
+        self.wait = wait
+        self.now = 0.0
+        self._arrivals = iter(arrivals)
+        self._heap = []       # (tiempo, tipo, secuencia, nombre, tamaño, duración)
+        self._seq = 0
+        self.queue = deque()  # (llegada, nombre, tamaño, duración) esperando memoria
+        self.arrived = self.started = self.rejected = self.finished = 0
+        self.wait_total = self.wait_max = 0.0
+        self.queue_max = 0
+        self._queue_area = self._used_area = 0.0  # integrales en el tiempo
+        self.sample_interval = sample_interval
+        self.samples = []
+        self._next_sample = 0.0
+        self._pull()
+
+    def _push(self, t, kind, name, size=0, duration=0.0):
+        self._seq += 1
+        heapq.heappush(self._heap, (t, kind, self._seq, name, size, duration))
+
+    def _pull(self):
+        arrival = next(self._arrivals, None)
+        if arrival is not None:
+            t, name, size, duration = arrival
+            self._push(t, ARRIVAL, name, size, duration)
+
+    def _advance(self, t):
+        """Lleva el reloj a t acumulando las integrales y las muestras"""
+        if self.sample_interval:
+            while self._next_sample <= t:
+                self.samples.append(Sample(self._next_sample, self.manager.used / self.manager.total_memory,
+                                           len(self.queue)))
+                self._next_sample += self.sample_interval
+        dt = t - self.now
+        self._queue_area += len(self.queue) * dt
+        self._used_area += self.manager.used * dt
+        self.now = t
+
+    def _start(self, arrival, name, size, duration):
+        if self.manager.allocate(name, size) == -1:
+            return False
+        waited = self.now - arrival
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.started += 1
+        self._push(self.now + duration, DEPARTURE, name)
+        return True
+
+    def step(self):
+        """Procesa el próximo evento; devuelve (tiempo, tipo, nombre) o None si no quedan"""
+        if not self._heap:
+            return None
+        t, kind, _, name, size, duration = heapq.heappop(self._heap)
+        self._advance(t)
+        if kind == ARRIVAL:
+            self.arrived += 1
+            self._pull()
+            if size > self.manager.max_request:
+                self.rejected += 1
+            elif self.queue or not self._start(t, name, size, duration):
+                # Con cola no se adelanta a nadie: FIFO estricto
+                if self.wait:
+                    self.queue.append((t, name, size, duration))
+                    self.queue_max = max(self.queue_max, len(self.queue))
+                else:
+                    self.rejected += 1
+        else:
+            self.manager.deallocate_memory(name)
+            self.finished += 1
+            while self.queue and self._start(*self.queue[0]):
+                self.queue.popleft()
+        return t, kind, name
+
+    def run(self, until=None):
+        """Avanza hasta agotar los eventos o hasta el instante until"""
+        heap = self._heap
+        while heap and (until is None or heap[0][0] <= until):
+            self.step()
+        if until is not None and until > self.now:
+            self._advance(until)
+        return self.report()
+
+    def report(self):
+        """Resumen de espera, cola y utilización promediados en el tiempo"""
+        span = self.now or 1.0
+        return {
+            "time": self.now, "arrived": self.arrived, "started": self.started, "rejected": self.rejected,
+            "finished": self.finished, "waiting": len(self.queue),
+            "wait_mean": self.wait_total / self.started if self.started else 0.0, "wait_max": self.wait_max,
+            "queue_mean": self._queue_area / span, "queue_max": self.queue_max,
+            "utilization": self._used_area / span / self.manager.total_memory,
+        }
+
+
+def format_report(r):
+    return (f"Tiempo simulado: {r['time']:.1f} | Llegadas: {r['arrived']} | Iniciados: {r['started']} | "
+            f"Rechazados: {r['rejected']} | En espera al final: {r['waiting']}\n"
+            f"Espera media: {r['wait_mean']:.2f} (máx. {r['wait_max']:.2f}) | "
+            f"Cola media: {r['queue_mean']:.2f} (máx. {r['queue_max']})\n"
+            f"Utilización media: {r['utilization'] * 100:.1f}% | "
+            f"{r['events_per_sec']:,.0f} eventos/s en {r['elapsed']:.3f} s")
+
+
+def main(argv=None):
+    from replay import make_manager
+    from strategies import STRATEGIES
+    from workload import arrivals
+
+    ap = argparse.ArgumentParser(description="Simulación de eventos discretos con tiempos de vida")
+    ap.add_argument("--sizes", default="uniform:1-20", help="distribución de tamaños (ver workload.py)")
+    ap.add_argument("--lifetimes", default="exp:50", help="distribución de duraciones")
+    ap.add_argument("--rate", type=float, default=1.0, help="llegadas por unidad de tiempo")
+    ap.add_argument("--events", type=int, default=100000, help="número de procesos")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--memory", type=int, default=1000)
+    ap.add_argument("--strategy", choices=sorted(STRATEGIES) + ["buddy"], default="worst")
+    ap.add_argument("--no-wait", action="store_true", help="rechaza en vez de encolar lo que no cabe")
+    ap.add_argument("--until", type=float, help="detiene la simulación en este instante")
+    ap.add_argument("--sample", type=float, metavar="INTERVALO", help="muestrea utilización y cola cada INTERVALO")
+    ap.add_argument("--series", metavar="CSV", help="guarda las muestras (requiere --sample)")
+    ap.add_argument("--json", action="store_true", help="imprime el resumen en JSON")
+    args = ap.parse_args(argv)
+
+    manager = make_manager(args.memory, strategy=args.strategy, history_size=0)
+    sim = Simulation(manager, arrivals(args.sizes, args.lifetimes, args.rate, args.seed, args.events),
+                     wait=not args.no_wait, sample_interval=args.sample)
+    t0 = time.perf_counter()
+    report = sim.run(args.until)
+    report["elapsed"] = time.perf_counter() - t0
+    report["events_per_sec"] = (sim.arrived + sim.finished) / report["elapsed"] if report["elapsed"] else 0.0
+    if args.series:
+        with open(args.series, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(Sample._fields)
+            writer.writerows(sim.samples)
+    print(json.dumps(report) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Capa de slabs para peticiones pequeñas de tamaño fijo.
+
+Los tamaños pequeños más comunes (clases) se sirven desde slabs: bloques de
+``objects_per_slab`` objetos de la clase que se piden de una vez al
+MemoryManager de abajo. Cada slab tiene su pila de huecos libres y cada clase
+un conjunto de slabs parciales, así que asignar y liberar un objeto es O(1).
+Un slab que se vacía se devuelve a la memoria salvo que sea el último
+parcial de su clase. Las peticiones de otros tamaños van directas al
+administrador con su política general.
+"""
+
+from history import ALLOC, FREE
+from memory_manager import ManagerMixin, MemoryManager
+
+
+class Slab:
+    __slots__ = ("name", "cls", "start", "free", "owners", "live")
+
+    def __init__(self, name, cls, start, objects):
+        self.name = name
+        self.cls = cls
+        self.start = start
+        self.free = list(range(objects - 1, -1, -1))  # pila: el hueco 0 sale primero
+        self.owners = [None] * objects                # nombre del objeto en cada hueco
+        self.live = 0
+
+
+class SlabAllocator(ManagerMixin):
+    """Envuelve un MemoryManager y expone su misma interfaz de uso"""
+
+    def __init__(self, manager, classes=(1, 2, 3, 4), objects_per_slab=16):
+        self.manager = manager
+        self.classes = tuple(sorted(classes))
+        self.objects_per_slab = objects_per_slab
+        self.processes = {}  # nombre -> (start, size), incluye objetos de slab
+        self._objects = {}   # nombre -> (slab, hueco)
+        self._partial = {c: {} for c in self.classes}  # clase -> slabs con huecos (dict ordenado)
+        self._slab_by_name = {}
+        self._slabs = {c: 0 for c in self.classes}     # slabs vivos por clase
+        self._objects_live = {c: 0 for c in self.classes}
+        self._slab_seq = 0
+        self._active = []
+        self._active_pos = {}
+        self.listeners = []
+        self._batch = None
+        manager.add_listener(self._notify)
+
+    # Lo que no cambia se delega en el administrador de abajo
+    total_memory = property(lambda self: self.manager.total_memory)
+    history = property(lambda self: self.manager.history)
+    strategy = property(lambda self: self.manager.strategy)
+    used = property(lambda self: self.manager.used)
+    max_request = property(lambda self: self.manager.max_request)
+
+    def set_strategy(self, key):
+        self.manager.set_strategy(key)
+
+    def _notify(self, changes):
+        for op, start, size, owner in changes:
+            if op != "alloc":
+                continue
+            # Tras una compactación los tramos reaparecen en otra dirección
+            slab = self._slab_by_name.get(owner)
+            if slab is not None and slab.start != start:
+                self._move_slab(slab, start)
+            elif owner in self.processes and owner not in self._objects:
+                self.processes[owner] = (start, size)
+        super()._notify(changes)
+
+    def _move_slab(self, slab, start):
+        slab.start = start
+        for slot, name in enumerate(slab.owners):
+            if name is not None:
+                self.processes[name] = (start + slot * slab.cls, slab.cls)
+
+    def _track(self, name, start, size):
+        self.processes[name] = (start, size)
+        self._activate(name)
+
+    def _untrack(self, name):
+        self._deactivate(name)
+        return self.processes.pop(name)
+
+    def allocate(self, process_name, size):
+        """Asigna desde un slab si size es una clase; si no, con la política general"""
+        if process_name in self.processes:
+            raise ValueError(f"El proceso {process_name} ya está en memoria")
+        if size not in self._partial:
+            start = self.manager.allocate(process_name, size)
+            if start != -1:
+                self._track(process_name, start, size)
+            return start
+        partial = self._partial[size]
+        if not partial:
+            manager = self.manager
+            if not manager.can_fit(size * self.objects_per_slab):
+                # No entra un slab entero: el objeto va suelto con la política general
+                start = manager.allocate(process_name, size)
+                if start != -1:
+                    self._track(process_name, start, size)
+                return start
+            self._slab_seq += 1
+            name = f"slab{size}#{self._slab_seq}"
+            start = manager.allocate(name, size * self.objects_per_slab)
+            slab = Slab(name, size, start, self.objects_per_slab)
+            partial[name] = slab
+            self._slab_by_name[name] = slab
+            self._slabs[size] += 1
+        slab = next(iter(partial.values()))
+        slot = slab.free.pop()
+        slab.owners[slot] = process_name
+        slab.live += 1
+        if not slab.free:
+            del partial[slab.name]
+        start = slab.start + slot * size
+        self._objects[process_name] = (slab, slot)
+        self._objects_live[size] += 1
+        self._track(process_name, start, size)
+        self.history.record(ALLOC, process_name, size, start, size * self.objects_per_slab)
+        self._notify([("alloc", start, size, process_name)])
+        return start
+
+    def deallocate_memory(self, process_name):
+        obj = self._objects.pop(process_name, None)
+        if obj is None:
+            if process_name in self.processes:
+                self._untrack(process_name)
+                return self.manager.deallocate_memory(process_name)
+            return False
+        start, size = self._untrack(process_name)
+        slab, slot = obj
+        partial = self._partial[slab.cls]
+        was_full = slab.name not in partial
+        slab.free.append(slot)
+        slab.owners[slot] = None
+        slab.live -= 1
+        self._objects_live[slab.cls] -= 1
+        self.history.record(FREE, process_name)
+        self._notify([("free", start, size, process_name)])
+        if slab.live == 0 and len(partial) > (0 if was_full else 1):
+            # Vacío y con otro slab parcial en la clase: se devuelve a la memoria
+            partial.pop(slab.name, None)
+            del self._slab_by_name[slab.name]
+            self._slabs[slab.cls] -= 1
+            self.manager.deallocate_memory(slab.name)
+        elif was_full:
+            partial[slab.name] = slab
+        return True
+
+    def compact(self):
+        return self.manager.compact()
+
+    def stats(self):
+        return self.manager.stats()
+
+    def class_stats(self):
+        """Por clase: (objetos vivos, capacidad, slabs)"""
+        return {c: (self._objects_live[c], self._slabs[c] * self.objects_per_slab, self._slabs[c])
+                for c in self.classes}
+
+    def extents(self, lo=0, hi=None):
+        """Tramos lógicos en orden de dirección: cada slab se muestra como sus objetos vivos"""
+        hi = self.total_memory if hi is None else hi
+        out = []
+        for start, size, owner in self.manager.extents(lo, hi):
+            slab = self._slab_by_name.get(owner)
+            if slab is None:
+                out.append((start, size, owner))
+                continue
+            for slot, name in enumerate(slab.owners):
+                s = start + slot * slab.cls
+                if name is not None and s < hi and s + slab.cls > lo:
+                    out.append((s, slab.cls, name))
+        return out
+
+    # Celdas de los tramos lógicos: cada objeto de slab con su nombre
+    cells = MemoryManager.cells
+    memory = MemoryManager.memory
+
+    def occupancy(self, lo, hi, columns):
+        return self.manager.occupancy(lo, hi, columns)
@@ -0,0 +1,121 @@
+"""Instantáneas binarias del estado de un MemoryManager.
+
+Formato (little-endian, secciones alineadas a 8 bytes):
+    cabecera HEADER
+    starts   count × int64   inicio de cada tramo, en orden de dirección
+    sizes    count × int64   tamaño de cada tramo
+    active   count × int64   orden de la lista de activos (índices de tramo)
+    names    names_len bytes nombres en UTF-8 separados por NUL, en orden de tramo
+
+Se guardan los tramos y no las celdas: el índice de huecos (y el arreglo de
+dueños del modo NumPy o el árbol buddy) se reconstruye de ellos. Al abrir, el
+archivo se mapea con mmap y las secciones se leen como memoryview sin
+copiarlas ni interpretarlas; ``load`` crea cada vez un administrador
+independiente, así que una misma instantánea sirve para reanudar o para
+ramificar varias simulaciones. El historial no forma parte del estado.
+
+Uso:
+    python snapshot.py estado.snap          resumen de la instantánea
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b"MSNAP1\n\0"
+HEADER = struct.Struct("<8s8s16sqqqqqqd?7x")
+# magic, backend, estrategia, total, tramos, rover de siguiente ajuste,
+# compactaciones, unidades compactadas, bytes de nombres, tiempo compactando, auto_compact
+
+if sys.byteorder != "little":  # las secciones se leen con el orden nativo
+    raise ImportError("snapshot.py requiere una plataforma little-endian")
+
+
+def save(manager, path):
+    """Escribe el estado de manager (MemoryManager o subclase) en path"""
+    starts = manager._starts
+    extents = manager._extents
+    names = [extents[s][1] for s in starts]
+    if any("\0" in name for name in names):
+        raise ValueError("Los nombres de proceso no pueden contener NUL")
+    index = {name: i for i, name in enumerate(names)}
+    blob = "\0".join(names).encode("utf-8")
+    next_fit = manager._strategies.get("next")
+    header = HEADER.pack(MAGIC, manager.backend.encode(), manager.strategy.key.encode(), manager.total_memory,
+                         len(starts), getattr(next_fit, "rover", 0), manager.compactions,
+                         manager.compacted_units, len(blob), manager.compact_time, manager.auto_compact)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(array("q", starts).tobytes())
+        f.write(array("q", [extents[s][0] for s in starts]).tobytes())
+        f.write(array("q", [index[name] for name in manager._active]).tobytes())
+        f.write(blob)
+
+
+class Snapshot:
+    """Instantánea mapeada en memoria; las secciones son memoryview de solo lectura"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        (magic, backend, strategy, self.total_memory, self.count, self.rover, self.compactions,
+         self.compacted_units, names_len, self.compact_time, self.auto_compact) = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            view.release()
+            self._map.close()
+            raise ValueError(f"{path} no es una instantánea")
+        self.backend = backend.rstrip(b"\0").decode()
+        self.strategy = strategy.rstrip(b"\0").decode()
+        pos, width = HEADER.size, 8 * self.count
+        self.starts = view[pos:pos + width].cast("q")
+        self.sizes = view[pos + width:pos + 2 * width].cast("q")
+        self.active = view[pos + 2 * width:pos + 3 * width].cast("q")
+        self.names = view[pos + 3 * width:pos + 3 * width + names_len]
+        self._view = view
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for section in (self.starts, self.sizes, self.active, self.names, self._view):
+            section.release()
+        self._map.close()
+
+    def restore(self, **kwargs):
+        """Crea un administrador nuevo con este estado; kwargs van a make_manager"""
+        from replay import make_manager
+        kwargs.setdefault("auto_compact", self.auto_compact)
+        manager = make_manager(self.total_memory, self.backend, self.strategy, **kwargs)
+        names = str(self.names, "utf-8").split("\0") if self.count else []
+        manager._restore(self.starts.tolist(), self.sizes.tolist(), names, [names[i] for i in self.active.tolist()])
+        if self.rover:
+            manager._get_strategy("next").rover = self.rover
+        manager.compactions, manager.compacted_units = self.compactions, self.compacted_units
+        manager.compact_time = self.compact_time
+        return manager
+
+
+def load(path, **kwargs):
+    """Abre la instantánea, crea el administrador y libera el mapeo"""
+    with Snapshot(path) as snap:
+        return snap.restore(**kwargs)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Uso: python snapshot.py estado.snap", file=sys.stderr)
+        return 2
+    with Snapshot(argv[0]) as snap:
+        used = sum(snap.sizes)
+        print(f"Modo: {snap.backend} | Estrategia: {snap.strategy} | Memoria: {snap.total_memory}\n"
+              f"Procesos: {snap.count} | Usado: {used} | Compactaciones: {snap.compactions}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
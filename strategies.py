@@ -0,0 +1,73 @@
+"""Políticas de ubicación para MemoryManager.
+
+Cada estrategia solo decide en qué bloque libre va una petición; el trabajo
+pesado lo hacen los índices de FreeBlockIndex: el orden por dirección (con el
+máximo por cubeta) para primer y siguiente ajuste, y el orden por tamaño
+(montículo / lista ordenada) para peor y mejor ajuste. Cada estrategia pide
+en attach() los índices opcionales que usa.
+"""
+
+
+class FitStrategy:
+    key = ""
+    label = ""
+
+    def attach(self, index):
+        """Prepara el índice que necesita la estrategia"""
+
+    def find(self, index, size):
+        """Devuelve (start, block_size) del bloque elegido o None"""
+        raise NotImplementedError
+
+    def placed(self, start, size):
+        """Aviso de que se asignó [start, start+size)"""
+
+
+class FirstFit(FitStrategy):
+    key, label = "first", "Primer Ajuste"
+
+    def attach(self, index):
+        index.track_bucket_max()
+
+    def find(self, index, size):
+        return index.first_fit(size)
+
+
+class NextFit(FitStrategy):
+    key, label = "next", "Siguiente Ajuste"
+
+    def __init__(self):
+        self.rover = 0  # donde terminó la última asignación
+
+    def attach(self, index):
+        index.track_bucket_max()
+
+    def find(self, index, size):
+        block = index.containing(self.rover)
+        lo = block[0] if block else self.rover
+        return index.first_fit(size, lo) or index.first_fit(size)
+
+    def placed(self, start, size):
+        self.rover = start + size
+
+
+class BestFit(FitStrategy):
+    key, label = "best", "Mejor Ajuste"
+
+    def attach(self, index):
+        index.track_size_order()
+
+    def find(self, index, size):
+        return index.smallest_fitting(size)
+
+
+class WorstFit(FitStrategy):
+    key, label = "worst", "Peor Ajuste"
+
+    def find(self, index, size):
+        # El mayor bloque libre sale del índice; si no cabe ahí no cabe en ninguno
+        best = index.largest()
+        return best if best and best[1] >= size else None
+
+
+STRATEGIES = {cls.key: cls for cls in (FirstFit, NextFit, BestFit, WorstFit)}
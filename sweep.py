@@ -0,0 +1,107 @@
+"""Barrido de parámetros del administrador de memoria en varios procesos.
+
+Cada combinación de ejes (tamaño de memoria, estrategia, distribución de
+tamaños, tasa de liberación y semilla) es una simulación independiente que
+corre en un proceso del pool; los resultados se escriben a medida que llegan.
+
+Distribuciones de tamaño: las de workload.py (uniform:1-20, exp:8,
+bimodal:1-4,40-80,0.9, fixed:5, trace:traza.bin).
+
+Uso:
+    python sweep.py --memory 1000 100000 --strategy worst best \\
+        --sizes uniform:1-20 exp:8 --free-rate 0.3 0.5 --seeds 10 --out res.jsonl
+    python sweep.py --auto-compact both --free-rate 0.3 --seeds 5 --out compactar.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from replay import make_manager
+from strategies import STRATEGIES
+from workload import size_sampler
+
+FIELDS = ("memory", "strategy", "sizes", "free_rate", "auto_compact", "seed", "ops", "allocated", "failed",
+          "success_rate", "fragmentation", "largest", "used", "ops_per_sec", "compactions", "compacted_units",
+          "compact_time")
+
+
+def run_config(config):
+    """Ejecuta una simulación y devuelve su fila de resultados"""
+    memory, strategy, sizes, free_rate, auto_compact, seed, ops = config
+    rng = random.Random(seed)
+    sample = size_sampler(sizes, rng)
+    manager = make_manager(memory, strategy=strategy, history_size=0, auto_compact=auto_compact)
+    allocate, deallocate, victim = manager.allocate, manager.deallocate_memory, manager.random_process
+    allocated = failed = 0
+    t0 = time.perf_counter()
+    for i in range(ops):
+        if manager.processes and rng.random() < free_rate:
+            deallocate(victim(rng))
+        elif allocate(f"P{i}", sample()) == -1:
+            failed += 1
+        else:
+            allocated += 1
+    elapsed = time.perf_counter() - t0
+    st = manager.stats()
+    requests = allocated + failed
+    return dict(zip(FIELDS, (memory, strategy, sizes, free_rate, auto_compact, seed, ops, allocated, failed,
+                             allocated / requests if requests else 1.0, st.fragmentation, st.largest, st.used,
+                             ops / elapsed if elapsed else 0.0, manager.compactions, manager.compacted_units,
+                             manager.compact_time)))
+
+
+def configs(args):
+    compact = (False, True) if args.auto_compact == "both" else (args.auto_compact == "on",)
+    return itertools.product(args.memory, args.strategy, args.sizes, args.free_rate, compact,
+                             range(args.seed0, args.seed0 + args.seeds), [args.ops])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Barrido de parámetros en paralelo")
+    ap.add_argument("--memory", type=int, nargs="+", default=[1000])
+    ap.add_argument("--strategy", nargs="+", choices=sorted(STRATEGIES) + ["buddy"], default=["worst"])
+    ap.add_argument("--sizes", nargs="+", default=["uniform:1-20"], help="distribuciones de tamaño")
+    ap.add_argument("--free-rate", type=float, nargs="+", default=[0.4], help="probabilidad de liberar en cada paso")
+    ap.add_argument("--auto-compact", choices=("off", "on", "both"), default="off",
+                    help="compactación automática ante fallos por fragmentación; both compara ambas")
+    ap.add_argument("--seeds", type=int, default=1, help="semillas por combinación")
+    ap.add_argument("--seed0", type=int, default=0)
+    ap.add_argument("--ops", type=int, default=10000, help="operaciones por simulación")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--out", help="archivo .jsonl o .csv (por defecto JSONL a stdout)")
+    args = ap.parse_args(argv)
+    for spec in args.sizes:
+        size_sampler(spec, random)  # validar antes de lanzar el pool
+
+    total = (len(args.memory) * len(args.strategy) * len(args.sizes) * len(args.free_rate) * args.seeds
+             * (2 if args.auto_compact == "both" else 1))
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    writer = None
+    if args.out and args.out.endswith(".csv"):
+        writer = csv.DictWriter(out, FIELDS)
+        writer.writeheader()
+    t0 = time.perf_counter()
+    try:
+        with Pool(args.workers) as pool:
+            chunk = max(1, total // (args.workers * 16))
+            for row in pool.imap_unordered(run_config, configs(args), chunksize=chunk):
+                if writer:
+                    writer.writerow(row)
+                else:
+                    out.write(json.dumps(row) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{total} simulaciones en {time.perf_counter() - t0:.2f} s con {args.workers} procesos", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,88 +1,42 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 
-class MemoryManager:
+from history import ALLOC, FAIL, FREE
+from memory_manager import MemoryManager as BaseMemoryManager
+
+def format_event(event, label):
+    """Formato del historial propio de esta versión"""
+    op, pid, size, start, block = event[:5]
+    if op == ALLOC:
+        return f"✓ Asignado {pid} (tamaño {size}) en posición {start} - Bloque libre usado: {block}"
+    if op == FAIL:
+        return f"✗ FALLÓ asignar {pid} (tamaño {size}) - Sin espacio suficiente"
+    if op == FREE:
+        return f"🗑️ Liberado proceso {pid}"
+    return str(pid)
+
+class MemoryManager(BaseMemoryManager):
     def __init__(self, total_memory=100):
-        self.total_memory = total_memory
-        self.memory = [None] * total_memory
-        self.history = []
-        
-    def worst_fit(self, process_name, size):
-        """Algoritmo de Peor Ajuste"""
-        best_start = -1
-        best_size = -1
-        current_start = -1
-        current_size = 0
-        
-        # Encontrar el bloque libre más grande
-        for i in range(self.total_memory + 1):
-            if i < self.total_memory and self.memory[i] is None:
-                if current_start == -1:
-                    current_start = i
-                current_size += 1
-            else:
-                if current_size >= size and current_size > best_size:
-                    best_start = current_start
-                    best_size = current_size
-                current_start = -1
-                current_size = 0
-        
-        if best_start != -1:
-            self.allocate_memory(best_start, process_name, size)
-            self.history.append(f"✓ Asignado {process_name} (tamaño {size}) en posición {best_start} - Bloque libre usado: {best_size}")
-            return best_start
-        
-        self.history.append(f"✗ FALLÓ asignar {process_name} (tamaño {size}) - Sin espacio suficiente")
-        return -1
+        super().__init__(total_memory)
+        self.history.formatter = format_event
     
     def check_free_space(self, start, size):
         if start + size > self.total_memory:
             return False
-        return all(self.memory[i] is None for i in range(start, start + size))
-    
-    def allocate_memory(self, start, process_name, size):
-        for i in range(start, start + size):
-            self.memory[i] = process_name
-    
-    def deallocate_memory(self, process_name):
-        for i in range(self.total_memory):
-            if self.memory[i] == process_name:
-                self.memory[i] = None
-        self.history.append(f"🗑️ Liberado proceso {process_name}")
+        block = self.free_index.containing(start)
+        return block is not None and start + size <= block[0] + block[1]
     
     def get_fragmentation(self):
         """Calcula fragmentación externa (número de bloques libres)"""
-        free_blocks = 0
-        in_free_block = False
-        
-        for cell in self.memory:
-            if cell is None and not in_free_block:
-                free_blocks += 1
-                in_free_block = True
-            elif cell is not None:
-                in_free_block = False
-        
-        return free_blocks
+        return self.stats().fragmentation
     
     def get_largest_free_block(self):
         """Encuentra el bloque libre más grande"""
-        max_block = 0
-        current_block = 0
-        
-        for cell in self.memory:
-            if cell is None:
-                current_block += 1
-                max_block = max(max_block, current_block)
-            else:
-                current_block = 0
-        
-        return max_block
+        return self.stats().largest
     
     def get_memory_usage(self):
         """Calcula porcentaje de uso de memoria"""
-        used = sum(1 for cell in self.memory if cell is not None)
-        return (used / self.total_memory) * 100
+        return (self.used / self.total_memory) * 100
 
 class MemorySimulatorApp:
     def __init__(self, root):
@@ -336,8 +290,7 @@ class MemorySimulatorApp:
         self.update_display()
         
         # Actualizar estadísticas durante la demo
-        used_memory = sum(1 for cell in self.memory_manager.memory if cell is not None)
-        usage_percentage = (used_memory / len(self.memory_manager.memory)) * 100
+        usage_percentage = self.memory_manager.get_memory_usage()
         self.stats_label.config(text=f"Demo en progreso... ({index + 1}/{len(self.current_demo_sizes)}) - Memoria usada: {usage_percentage:.1f}%")
         
         # Siguiente paso con retardo
@@ -379,13 +332,9 @@ class MemorySimulatorApp:
             messagebox.showinfo("Demo en curso", "Espera a que termine la demo actual.")
             return
             
-        active_processes = []
-        for cell in self.memory_manager.memory:
-            if cell is not None and cell not in active_processes:
-                active_processes.append(cell)
+        process_to_free = self.memory_manager.random_process()
         
-        if active_processes:
-            process_to_free = random.choice(active_processes)
+        if process_to_free is not None:
             self.memory_manager.deallocate_memory(process_to_free)
             self.update_display()
         else:
@@ -441,12 +390,10 @@ class MemorySimulatorApp:
         
         # Actualizar estadísticas (solo si no hay demo en curso)
         if not self.demo_running:
-            fragmentation = self.memory_manager.get_fragmentation()
-            largest_block = self.memory_manager.get_largest_free_block()
-            used_memory = sum(1 for cell in self.memory_manager.memory if cell is not None)
+            used_memory, _, fragmentation, largest_block = self.memory_manager.stats()
             usage_percentage = self.memory_manager.get_memory_usage()
             
-            stats_text = f"PEOR AJUSTE | Memoria usada: {used_memory}/50 ({usage_percentage:.1f}%) | "
+            stats_text = f"PEOR AJUSTE | Memoria usada: {used_memory}/{self.memory_manager.total_memory} ({usage_percentage:.1f}%) | "
             stats_text += f"Fragmentación: {fragmentation} bloques | Mayor bloque libre: {largest_block}"
             
             # Color según el nivel de fragmentación
@@ -459,7 +406,7 @@ class MemorySimulatorApp:
         
         # Actualizar historial
         self.history_text.delete(1.0, tk.END)
-        for entry in self.memory_manager.history[-10:]:
+        for entry in self.memory_manager.history.tail(10):
             self.history_text.insert(tk.END, f"{entry}\n")
         self.history_text.see(tk.END)
 
@@ -1,77 +1,69 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import random
+import tkinter as tk
+from contextlib import nullcontext
+from itertools import islice
+from tkinter import ttk, messagebox, filedialog
 
-class MemoryManager:
-    def __init__(self, total_memory=100):
-        self.total_memory = total_memory
-        self.memory = [None] * total_memory
-        self.history = []
-
-    def _free_blocks(self):
-        """Devuelve lista de (start, size) de bloques libres"""
-        blocks = []
-        start = None
-        for i, cell in enumerate(self.memory + [1]):  # sentinel para cerrar bloque al final
-            if cell is None:
-                if start is None:
-                    start = i
-            else:
-                if start is not None:
-                    blocks.append((start, i - start))
-                    start = None
-        return blocks
-
-    def worst_fit(self, process_name, size):
-        blocks = self._free_blocks()
-        # Buscar el bloque libre más grande que quepa
-        best = max(((s, l) for s, l in blocks if l >= size), key=lambda x: x[1], default=None)
-        if best:
-            start = best[0]
-            self.allocate_memory(start, process_name, size)
-            self.history.append(f"Asignado {process_name} (tamaño {size}) en {start} - Peor Ajuste (bloque {best[1]})")
-            return start
-        self.history.append(f"FALLÓ asignar {process_name} (tamaño {size}) - Sin espacio")
-        return -1
-
-    def allocate_memory(self, start, process_name, size):
-        for i in range(start, start + size):
-            self.memory[i] = process_name
-
-    def deallocate_memory(self, process_name):
-        changed = False
-        for i, v in enumerate(self.memory):
-            if v == process_name:
-                self.memory[i] = None
-                changed = True
-        if changed:
-            self.history.append(f"Liberado proceso {process_name}")
-
-    def stats(self):
-        used = sum(1 for c in self.memory if c is not None)
-        free = self.total_memory - used
-        blocks = self._free_blocks()
-        fragmentation = len(blocks)
-        largest = max((b for _, b in blocks), default=0)
-        return used, free, fragmentation, largest
+from memory_manager import MemoryManager
+from strategies import STRATEGIES
+from buddy import BuddyFit, BuddyMemoryManager
+from slab import SlabAllocator
+import workload
+from simulation import Simulation
+from timeline import Timeline
+from worker import DemoWorker
+from instrumentation import Profiler, instrument_manager
+from timeseries import SeriesRecorder, open_writer
+from pools import PooledMemoryManager
+
+# Etiqueta del combobox -> clave de estrategia
+ALGORITHMS = {cls.label: cls.key for cls in (*STRATEGIES.values(), BuddyFit)}
 
 class MemorySimulatorApp:
     DEMO_DELAY = 800
+    LAYOUT_DELAY = 60  # ms para agrupar ráfagas de <Configure>
+    MIN_CELL_W = 12    # ancho por unidad con el zoom automático
+    MAX_CELL_W = 200
+    LABEL_MIN_W = 30   # ancho mínimo de un bloque para rotularlo
+    PROCESS_LIST_MAX = 200
+    TIMELINE_MAX = 5000  # pasos que guarda la línea de tiempo (los más viejos se olvidan)
+    FPS = 30           # cuadros por segundo como máximo mientras corre una demo
+    SPEEDS = {"x1": 1, "x2": 2, "x5": 5, "x20": 20, "x100": 100, "Máx": 0}  # 0 = sin pausa entre pasos
+    COLORS = ['#FF6B6B','#4ECDC4','#45B7D1','#96CEB4','#FFEAA7','#DDA0DD','#98D8C8','#F7DC6F','#BB8FCE','#85C1E9']
 
     def __init__(self, root):
         self.root = root
         self.root.title("Simulador de Algoritmos de Memoria")
         self.root.minsize(800, 600)
         self.root.bind("<Configure>", self._on_root_configure)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.mem_size_var = tk.StringVar(value="50")
         self.size_var = tk.StringVar(value="5")
+        self.algo_var = tk.StringVar(value=STRATEGIES["worst"].label)
+        self.slab_var = tk.BooleanVar(value=False)
+        self.auto_compact_var = tk.BooleanVar(value=False)
+        self.tiers_var = tk.BooleanVar(value=False)
+        self.speed_var = tk.StringVar(value="x1")
+        self.profile_var = tk.BooleanVar(value=False)
+        self.profiler = Profiler()
         self.process_counter = 0
 
-        self.memory_manager = MemoryManager(int(self.mem_size_var.get()))
+        self._strip_pool = []   # items (rectángulo, texto) reutilizados por la tira principal
+        self._map_pool = []     # items reutilizados por el minimapa
+        self._tree_pool = []    # rectángulos del árbol buddy
+        self._pool_strips = []  # por pool: (items de su tira, texto con sus estadísticas)
+        self._view_rect = None  # marco de la ventana visible en el minimapa
+        self._cell_w = None     # píxeles por unidad; None = automático
+        self._view_lo = 0.0     # primera unidad visible
+        self._layout_id = None
+        self.timeline = None
+        self._worker = None     # hilo de la demo en curso
+        self._frame = None      # último cuadro del hilo; None = dibujar desde el administrador
+        self._series = None     # SeriesRecorder de la serie que se está grabando
+        self._set_manager(self._new_manager(int(self.mem_size_var.get())))
         self.demo_running = self.demo_paused = False
         self.current_demo_info = ""
-        self.current_demo_sequence = []
         self._after_id = None
 
         self._build_ui()
@@ -83,15 +75,21 @@ class MemorySimulatorApp:
         top = ttk.Frame(m); top.pack(fill=tk.X, pady=4)
         left = ttk.Frame(top); left.pack(side=tk.LEFT, fill=tk.X, expand=True)
         ttk.Label(left, text="Algoritmo:").grid(row=0, column=0, sticky=tk.W, padx=4)
-        ttk.Combobox(left, values=["Peor Ajuste"], state="readonly", width=15).grid(row=0, column=1, padx=4)
+        algo = ttk.Combobox(left, values=list(ALGORITHMS), textvariable=self.algo_var, state="readonly", width=15)
+        algo.grid(row=0, column=1, padx=4)
+        algo.bind("<<ComboboxSelected>>", lambda e: self.set_strategy())
         ttk.Label(left, text="Tamaño:").grid(row=0, column=2, sticky=tk.W, padx=4)
-        ttk.Spinbox(left, from_=1, to=500, textvariable=self.size_var, width=6).grid(row=0, column=3, padx=4)
+        ttk.Spinbox(left, from_=1, to=500, textvariable=self.size_var, width=10).grid(row=0, column=3, padx=4)
         ttk.Button(left, text="Agregar", command=self.add_process).grid(row=0, column=4, padx=3)
         ttk.Button(left, text="Liberar Aleatorio", command=self.free_random).grid(row=0, column=5, padx=3)
         ttk.Button(left, text="Limpiar Todo", command=self.clear_all).grid(row=0, column=6, padx=3)
         ttk.Label(left, text="Memoria:").grid(row=0, column=7, sticky=tk.W, padx=4)
-        ttk.Spinbox(left, from_=10, to=1000, textvariable=self.mem_size_var, width=6).grid(row=0, column=8, padx=4)
+        ttk.Spinbox(left, from_=10, to=10_000_000, textvariable=self.mem_size_var, width=6).grid(row=0, column=8, padx=4)
         ttk.Button(left, text="Aplicar Tamaño", command=self.set_memory_size).grid(row=0, column=9, padx=3)
+        ttk.Checkbutton(left, text="Slabs", variable=self.slab_var, command=self.clear_all).grid(row=0, column=10, padx=3)
+        ttk.Button(left, text="Compactar", command=self.compact).grid(row=0, column=11, padx=3)
+        ttk.Checkbutton(left, text="Auto", variable=self.auto_compact_var, command=self._apply_auto_compact).grid(row=0, column=12, padx=3)
+        ttk.Checkbutton(left, text="Niveles", variable=self.tiers_var, command=self.clear_all).grid(row=0, column=13, padx=3)
 
         right = ttk.Frame(top); right.pack(side=tk.RIGHT)
         demos = [
@@ -103,6 +101,7 @@ class MemorySimulatorApp:
         ttk.Label(right, text="Demos:").grid(row=0, column=0, padx=4)
         for i, (n, seq) in enumerate(demos):
             ttk.Button(right, text=n, width=10, command=lambda s=seq, name=n: self.start_demo_sequence(s, name)).grid(row=0, column=i+1, padx=2)
+        ttk.Button(right, text="Aleatoria", width=10, command=self.start_workload_demo).grid(row=0, column=len(demos)+1, padx=2)
 
         self.info_label = ttk.Label(m, text="Listo", background="#f0f0f0", relief=tk.SUNKEN, padding=4)
         self.info_label.pack(fill=tk.X, pady=4)
@@ -110,23 +109,56 @@ class MemorySimulatorApp:
         mem_frame = ttk.Frame(m); mem_frame.pack(fill=tk.BOTH, expand=True)
         wrap = ttk.Frame(mem_frame); wrap.pack(fill=tk.BOTH, expand=True)
         self.canvas = tk.Canvas(wrap, bg="white", highlightthickness=0)
-        self.h_scroll = ttk.Scrollbar(wrap, orient=tk.HORIZONTAL, command=self.canvas.xview)
-        self.canvas.configure(xscrollcommand=self.h_scroll.set)
+        self.h_scroll = ttk.Scrollbar(wrap, orient=tk.HORIZONTAL, command=self._on_xscroll)
+        self.minimap = tk.Canvas(wrap, bg="white", height=16, highlightthickness=1, highlightbackground="#999")
         self.canvas.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
+        self.minimap.pack(fill=tk.X, side=tk.BOTTOM, pady=2)
         self.h_scroll.pack(fill=tk.X, side=tk.BOTTOM)
-        self.canvas.bind("<Configure>", lambda e: self.update_display())
+        self.canvas.bind("<Configure>", lambda e: self._schedule_layout())
+        self.canvas.bind("<MouseWheel>", lambda e: self._zoom(1.25 if e.delta > 0 else 0.8, e.x))
+        self.canvas.bind("<Button-4>", lambda e: self._zoom(1.25, e.x))
+        self.canvas.bind("<Button-5>", lambda e: self._zoom(0.8, e.x))
+        self.minimap.bind("<Button-1>", self._on_minimap_click)
+        self.minimap.bind("<B1-Motion>", self._on_minimap_click)
+
+        tl = ttk.Frame(m); tl.pack(fill=tk.X, pady=2)
+        ttk.Label(tl, text="Línea de tiempo:").pack(side=tk.LEFT, padx=4)
+        ttk.Button(tl, text="◀", width=3, command=lambda: self._travel(lambda: self.timeline.back())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(tl, text="▶", width=3, command=lambda: self._travel(lambda: self.timeline.forward())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(tl, text="En vivo", command=lambda: self._travel(lambda: self.timeline.seek(len(self.timeline)))).pack(side=tk.LEFT, padx=2)
+        self.step_label = ttk.Label(tl, text="", width=16); self.step_label.pack(side=tk.RIGHT, padx=4)
+        # Solo el arrastre del usuario mueve la línea de tiempo: con command, cada set() desde
+        # update_display volvería más tarde con un valor viejo y pausaría la demo
+        self.time_scale = tk.Scale(tl, orient=tk.HORIZONTAL, from_=0, to=0, showvalue=False)
+        for event in ("<B1-Motion>", "<ButtonRelease-1>"): self.time_scale.bind(event, self._on_scrub)
+        self.time_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
 
         bottom = ttk.Frame(m); bottom.pack(fill=tk.X, pady=4)
         self.stats_label = ttk.Label(bottom, text=""); self.stats_label.pack(side=tk.LEFT, anchor=tk.W)
+        self.profile_label = ttk.Label(bottom, text="", foreground="#555", font=('Arial', 8))
+        self.profile_label.pack(side=tk.LEFT, anchor=tk.W, padx=8)
         self.pause_button = ttk.Button(bottom, text="Pausar Demo", command=self.toggle_pause, state=tk.DISABLED)
         self.pause_button.pack(side=tk.RIGHT, padx=4)
+        speed = ttk.Combobox(bottom, values=list(self.SPEEDS), textvariable=self.speed_var, state="readonly", width=5)
+        speed.pack(side=tk.RIGHT, padx=2)
+        speed.bind("<<ComboboxSelected>>", lambda e: self._apply_speed())
+        ttk.Label(bottom, text="Velocidad:").pack(side=tk.RIGHT)
+        ttk.Button(bottom, text="Exportar perfil", command=self.export_profile).pack(side=tk.RIGHT, padx=2)
+        self.series_button = ttk.Button(bottom, text="Grabar serie", command=self.toggle_series)
+        self.series_button.pack(side=tk.RIGHT, padx=2)
+        ttk.Checkbutton(bottom, text="Perfil", variable=self.profile_var, command=self._apply_profiling).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(bottom, text="Ajustar", width=7, command=self._zoom_fit).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(bottom, text="+", width=3, command=lambda: self._zoom(2)).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(bottom, text="−", width=3, command=lambda: self._zoom(0.5)).pack(side=tk.RIGHT, padx=2)
 
         text_frame = ttk.Frame(m); text_frame.pack(fill=tk.X, pady=4)
         pframe = ttk.Frame(text_frame); pframe.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=4)
         ttk.Label(pframe, text="Procesos Activos:", font=('Arial', 9, 'bold')).pack(anchor=tk.W)
         self.processes_text = tk.Text(pframe, height=4); self.processes_text.pack(fill=tk.X)
         hframe = ttk.Frame(text_frame); hframe.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=4)
-        ttk.Label(hframe, text="Historial:", font=('Arial', 9, 'bold')).pack(anchor=tk.W)
+        hhead = ttk.Frame(hframe); hhead.pack(fill=tk.X)
+        ttk.Label(hhead, text="Historial:", font=('Arial', 9, 'bold')).pack(side=tk.LEFT)
+        ttk.Button(hhead, text="Exportar", command=self.export_history).pack(side=tk.RIGHT)
         self.history_text = tk.Text(hframe, height=4); self.history_text.pack(fill=tk.X)
 
     def show_demo_info(self, text):
@@ -134,37 +166,119 @@ class MemorySimulatorApp:
         self.info_label.config(text=text)
 
     def start_demo_sequence(self, sizes, demo_name):
+        self.start_demo(lambda: self._event_stepper((workload.ALLOC, f"P{i}", s) for i, s in enumerate(sizes)),
+                        demo_name)
+
+    def start_workload_demo(self):
+        """Simulación con llegadas, duraciones y cola de espera (ver simulation.py)"""
+        total = max(1, self.memory_manager.total_memory)
+        arrivals = workload.arrivals(f"exp:{max(1, total // 12)}", "exp:8", seed=random.randrange(1 << 30), count=200)
+        def make_step():
+            self._sim = Simulation(self.memory_manager, arrivals)
+            return self._simulation_step
+        self.start_demo(make_step, "Aleatoria", status=self._simulation_status)
+
+    def _event_stepper(self, events):
+        """Paso de demo que aplica eventos (op, nombre, tamaño) consumidos de a uno"""
+        events, names = iter(events), {}  # nombre en la carga -> nombre en el simulador
+        def step():
+            event = next(events, None)
+            if event is None:
+                return False
+            op, wl_name, size = event
+            if op == workload.ALLOC:
+                self.process_counter += 1
+                name = names[wl_name] = f"P{self.process_counter}"
+                self.memory_manager.allocate(name, size)
+            elif wl_name in names:
+                self.memory_manager.deallocate_memory(names.pop(wl_name))
+            return True
+        return step
+
+    def _simulation_step(self):
+        if self._sim.step() is None:
+            return False
+        self.process_counter = self._sim.arrived  # la simulación nombra P1, P2, ... en orden de llegada
+        return True
+
+    def _simulation_status(self):
+        sim = self._sim
+        r = sim.report()
+        return (f"DEMO: Aleatoria | t = {sim.now:.1f} | En espera: {len(sim.queue)} | "
+                f"Espera media: {r['wait_mean']:.2f} | Utilización: {r['utilization'] * 100:.1f}%")
+
+    def start_demo(self, make_step, demo_name, status=None):
+        """Reinicia la memoria y ejecuta el paso make_step() en un hilo hasta que devuelva False.
+
+        La pausa entre pasos sale de la velocidad elegida; la ventana se redibuja
+        a lo sumo FPS veces por segundo desde el último cuadro publicado.
+        """
         if self.demo_running: return
         self.clear_all()
         self.show_demo_info(f"DEMO: {demo_name}")
         self.demo_running = True; self.demo_paused = False
-        self.current_demo_sequence = sizes[:]
         self.pause_button.config(state=tk.NORMAL, text="Pausar Demo")
         self.memory_manager.history.append(f"=== INICIO DEMO: {demo_name} ===")
-        self._step_demo(0)
+        self._worker = DemoWorker(self.memory_manager, make_step(), self._delay(), self.FPS, status,
+                                  self.timeline).start()
+        self._poll_frame()
+
+    def _delay(self):
+        speed = self.SPEEDS.get(self.speed_var.get(), 1)
+        return self.DEMO_DELAY / 1000 / speed if speed else 0
 
-    def _step_demo(self, idx):
-        if not self.demo_running or idx >= len(self.current_demo_sequence):
+    def _apply_speed(self):
+        if self._worker: self._worker.delay = self._delay()
+
+    def _poll_frame(self):
+        """Dibuja el último cuadro del hilo de la demo, como mucho FPS veces por segundo"""
+        w = self._worker
+        if w is None: return
+        frame = w.frame
+        if not w.paused and frame is not self._frame:
+            if self._frame is not None and frame.seq != self._frame.seq + 1:
+                self._dirty.append((0, frame.total_memory))  # hubo cuadros salteados
+            self._frame = frame
+            self._dirty.extend(frame.dirty)
+            if frame.info: self.info_label.config(text=frame.info)
+            self.update_display()
+        if w.done:
+            if w.error: messagebox.showerror("Error en la demo", str(w.error))
             return self.end_demo()
-        if self.demo_paused:
-            self._after_id = self.root.after(300, lambda: self._step_demo(idx))
-            return
-        size = self.current_demo_sequence[idx]
-        self.process_counter += 1
-        name = f"P{self.process_counter}"
-        self.memory_manager.worst_fit(name, size)
-        self.update_display()
-        self._after_id = self.root.after(self.DEMO_DELAY, lambda: self._step_demo(idx + 1))
+        self._after_id = self.root.after(1000 // self.FPS, self._poll_frame)
+
+    @property
+    def view(self):
+        """Lo que se dibuja: el cuadro de la demo en curso o el administrador"""
+        return self._frame or self.memory_manager
+
+    def _exclusive(self):
+        """Contexto para tocar el administrador desde Tk mientras corre el hilo de la demo"""
+        return self._worker.lock if self._worker else nullcontext()
 
     def toggle_pause(self):
         if not self.demo_running: return
         self.demo_paused = not self.demo_paused
+        if self.demo_paused:
+            # El hilo queda detenido: se dibuja (y se viaja en el tiempo) sobre el administrador
+            self._worker.pause()
+            self._frame = None
+            self._dirty.append((0, self.memory_manager.total_memory))
+            self.update_display()
+        else:
+            if self.timeline: self.timeline.seek(len(self.timeline))  # la demo sigue desde el presente
+            self._worker.resume()
         self.pause_button.config(text="Reanudar Demo" if self.demo_paused else "Pausar Demo")
         status = "PAUSADA" if self.demo_paused else "EJECUTANDO"
         base = self.current_demo_info or self.info_label.cget("text")
         self.info_label.config(text=f"Demo {status} - {base}")
 
     def end_demo(self):
+        if self._worker:
+            self._worker.stop()
+            self._worker = self._frame = None
+            self._dirty.append((0, self.memory_manager.total_memory))
+            self.update_display()
         if self._after_id:
             try: self.root.after_cancel(self._after_id)
             except Exception: pass
@@ -178,26 +292,29 @@ class MemorySimulatorApp:
             messagebox.showinfo("Demo en curso", "Termina la demostración antes de agregar procesos.")
             return
         try:
-            size = int(self.size_var.get())
-            if size <= 0: raise ValueError
+            # Varios tamaños separados por comas se asignan en un lote (una notificación, un redibujo)
+            sizes = [int(v) for v in self.size_var.get().split(",")]
+            if min(sizes) <= 0: raise ValueError
         except Exception:
             return messagebox.showerror("Error", "Tamaño inválido")
-        self.process_counter += 1
-        name = f"P{self.process_counter}"
-        if self.memory_manager.worst_fit(name, size) == -1:
-            messagebox.showwarning("Sin memoria", "No hay espacio suficiente")
-            self.process_counter -= 1
+        names = [f"P{self.process_counter + i}" for i in range(1, len(sizes) + 1)]
+        starts = self.memory_manager.allocate_many(sizes, names)
+        failed = starts.count(-1)
+        self.process_counter += len(sizes) if len(sizes) > 1 else 1 - failed  # en un lote el número del fallido se saltea
+        if failed:
+            messagebox.showwarning("Sin memoria", "No hay espacio suficiente" if len(sizes) == 1
+                                   else f"No hubo espacio para {failed} de {len(sizes)} procesos")
         self.update_display()
 
     def free_random(self):
         if self.demo_running:
             messagebox.showinfo("Demo en curso", "Termina la demostración antes de liberar procesos.")
             return
-        procs = [c for c in set(self.memory_manager.memory) if c]
-        if not procs:
+        victim = self.memory_manager.random_process()
+        if victim is None:
             messagebox.showinfo("Info", "No hay procesos activos")
             return
-        self.memory_manager.deallocate_memory(random.choice(procs))
+        self.memory_manager.deallocate_memory(victim)
         self.update_display()
 
     def clear_all(self):
@@ -207,11 +324,64 @@ class MemorySimulatorApp:
             size = int(self.mem_size_var.get())
         except Exception:
             size = 50
-        self.memory_manager = MemoryManager(size)
+        self._set_manager(self._new_manager(size))
         self.process_counter = 0
         self.update_display()
         self.show_demo_info("Sistema reiniciado.")
 
+    def _strategy_key(self):
+        return ALGORITHMS.get(self.algo_var.get(), "worst")
+
+    def _new_manager(self, size):
+        key = self._strategy_key()
+        auto = self.auto_compact_var.get()
+        if self.tiers_var.get():
+            # Dos niveles: uno rápido y chico para las peticiones pequeñas y uno lento y grande
+            fast = max(1, size // 4)
+            manager = PooledMemoryManager([("rápida", fast, max(1, fast // 2), 1.0), ("lenta", size - fast, None, 4.0)],
+                                          "size", key, auto_compact=auto)
+        else:
+            manager = BuddyMemoryManager(size) if key == "buddy" else MemoryManager(size, key, auto_compact=auto)
+        return SlabAllocator(manager) if self.slab_var.get() else manager
+
+    def compact(self):
+        if self.demo_running:
+            messagebox.showinfo("Demo en curso", "Termina la demostración antes de compactar.")
+            return
+        r = self.memory_manager.compact()
+        self.update_display()
+        self.show_demo_info(f"Compactación: {r.blocks} bloques, {r.units} unidades movidas en {r.elapsed * 1000:.2f} ms")
+
+    def _base_managers(self):
+        """Los MemoryManager de abajo: sin la capa de slabs y uno por pool con niveles"""
+        base = getattr(self.memory_manager, "manager", self.memory_manager)
+        return [p.manager for p in base.pools] if hasattr(base, "pools") else [base]
+
+    def _apply_auto_compact(self):
+        for base in self._base_managers():
+            base.auto_compact = self.auto_compact_var.get()
+
+    def _travel(self, move):
+        """Mueve la línea de tiempo; una demo en marcha se pausa antes"""
+        if self.timeline is None: return
+        if self.demo_running and not self.demo_paused: self.toggle_pause()
+        move()
+        self.update_display()
+
+    def _on_scrub(self, event=None):
+        value = int(self.time_scale.get())
+        if self.timeline is not None and value != self.timeline.position:
+            self._travel(lambda: self.timeline.seek(value))
+
+    def set_strategy(self):
+        """Cambia la política de ubicación; entrar o salir del sistema buddy reinicia la memoria"""
+        if (self._strategy_key() == "buddy") != isinstance(self._base_managers()[0], BuddyMemoryManager):
+            return self.clear_all()
+        with self._exclusive():
+            self.memory_manager.set_strategy(self._strategy_key())
+        self.update_display()
+        self.show_demo_info(f"Algoritmo: {self.memory_manager.strategy.label}")
+
     def set_memory_size(self):
         if self.demo_running:
             messagebox.showinfo("Demo en curso", "Termina la demostración antes de cambiar el tamaño.")
@@ -221,42 +391,299 @@ class MemorySimulatorApp:
             if size <= 0: raise ValueError
         except Exception:
             return messagebox.showerror("Error", "Tamaño inválido")
-        self.memory_manager = MemoryManager(size)
+        self._set_manager(self._new_manager(size))
         self.process_counter = 0
         self.update_display()
         self.show_demo_info(f"Tamaño de memoria actualizado a {size}.")
 
-    def update_display(self):
-        self.canvas.delete("all")
-        colors = ['#FF6B6B','#4ECDC4','#45B7D1','#96CEB4','#FFEAA7','#DDA0DD','#98D8C8','#F7DC6F','#BB8FCE','#85C1E9']
-        min_w = 12
-        total = max(1, self.memory_manager.total_memory)
+    def _set_manager(self, manager):
+        if self._series is not None: self.toggle_series()  # la serie es de un solo administrador
+        self.memory_manager = manager
+        manager.add_listener(self._on_memory_change)
+        # Con slabs las notificaciones mezclan slabs y objetos: sin línea de tiempo
+        self.timeline = None if isinstance(manager, SlabAllocator) else Timeline(manager, self.TIMELINE_MAX)
+        self._cell_w = None
+        self._view_lo = 0.0
+        self._dirty = [(0, manager.total_memory)]
+        if self.profile_var.get(): self._apply_profiling()
+
+    def _on_memory_change(self, changes):
+        # Con la demo en marcha los cambios llegan con cada cuadro (ver _poll_frame)
+        if self._worker is None or self._worker.paused:
+            self._dirty.extend((start, size) for _, start, size, _ in changes)
+
+    def _color(self, p):
+        return 'white' if p is None else self.COLORS[(int(p[1:]) if p[1:].isdigit() else 0) % len(self.COLORS)]
+
+    @staticmethod
+    def _shade(fraction):
+        """Gris proporcional a la ocupación, cuantizado para fusionar columnas vecinas"""
+        level = 255 - int(round(fraction * 8)) * 20
+        return f"#{level:02x}{level:02x}{level:02x}"
+
+    def _schedule_layout(self):
+        """Agrupa las ráfagas de <Configure> en un único reacomodo diferido"""
+        if self._layout_id: self.root.after_cancel(self._layout_id)
+        self._layout_id = self.root.after(self.LAYOUT_DELAY, self._layout)
+
+    def _geometry(self):
+        """Devuelve (ancho visible, píxeles por unidad, unidades visibles)"""
+        total = max(1, self.view.total_memory)
         vw = max(1, self.canvas.winfo_width())
-        cell_w = max(min_w, vw / total)
+        fit = vw / total
+        cell_w = max(self.MIN_CELL_W, fit) if self._cell_w is None else min(self.MAX_CELL_W, max(fit, self._cell_w))
+        return vw, cell_w, min(total, vw / cell_w)
+
+    def _layout(self):
+        """Recalcula la ventana visible y redibuja tira y minimapa"""
+        self._layout_id = None
+        self._dirty = []
+        total = max(1, self.view.total_memory)
+        _, _, span = self._geometry()
+        self._view_lo = max(0.0, min(self._view_lo, total - span))
+        self.h_scroll.set(self._view_lo / total, (self._view_lo + span) / total)
+        self._draw_strip()
+        self._draw_minimap()
+
+    def _paint(self):
+        """Redibuja solo si algún cambio cae dentro de la ventana visible"""
+        if not self._dirty: return
+        dirty, self._dirty = self._dirty, []
+        _, _, span = self._geometry()
+        lo, hi = self._view_lo, self._view_lo + span
+        # Los pools se dibujan enteros: cualquier cambio los afecta
+        if hasattr(self.view, "pool_ranges") or any(start < hi and start + size > lo for start, size in dirty):
+            self._draw_strip()
+        self._draw_minimap()
+
+    def _draw_segments(self, canvas, pool, segs, y1, y2, labels):
+        """Dibuja (x1, x2, color, texto) reutilizando los items del pool y oculta los sobrantes"""
+        while len(pool) < len(segs):
+            pool.append((canvas.create_rectangle(0,0,0,0, outline='black'),
+                         canvas.create_text(0,0, font=('Arial',8)) if labels else None))
+        for (rect, text), (x1, x2, fill, label) in zip(pool, segs):
+            canvas.coords(rect, x1, y1, x2, y2)
+            canvas.itemconfig(rect, fill=fill, state=tk.NORMAL,
+                              outline='black' if labels and x2 - x1 >= 3 else fill)
+            if text is not None:
+                show = label and x2 - x1 >= self.LABEL_MIN_W
+                canvas.coords(text, (x1+x2)/2, (y1+y2)/2)
+                canvas.itemconfig(text, text=label or "", state=tk.NORMAL if show else tk.HIDDEN)
+        for rect, text in pool[len(segs):]:
+            canvas.itemconfig(rect, state=tk.HIDDEN)
+            if text is not None: canvas.itemconfig(text, state=tk.HIDDEN)
+
+    def _column_segments(self, lo, hi, columns, x0=0.0, px=1.0):
+        """Agrega la ocupación por columna de píxel y fusiona columnas del mismo tono"""
+        segs = []
+        for c, frac in enumerate(self.view.occupancy(lo, hi, columns)):
+            fill = self._shade(frac)
+            if segs and segs[-1][2] == fill: segs[-1] = (segs[-1][0], x0 + (c+1)*px, fill, None)
+            else: segs.append((x0 + c*px, x0 + (c+1)*px, fill, None))
+        return segs
+
+    def _draw_strip(self):
+        """Un rectángulo por bloque visible; si hay más bloques que píxeles, nivel de detalle por columna"""
+        mm = self.view
+        vw, cell_w, span = self._geometry()
         cell_h = max(18, int(self.canvas.winfo_height() * 0.08))
-        total_w = int(cell_w * total)
-        self.canvas.config(scrollregion=(0,0,total_w,cell_h+20))
-        for i, p in enumerate(self.memory_manager.memory):
-            x1, x2 = i*cell_w, (i+1)*cell_w
-            y1, y2 = 10, 10+cell_h
-            col = 'white' if p is None else colors[(int(p[1:]) if p and p[1:].isdigit() else 0) % len(colors)]
-            text = "" if p is None else p
-            self.canvas.create_rectangle(x1,y1,x2,y2, fill=col, outline='black')
-            if text and cell_w > 15: self.canvas.create_text((x1+x2)/2,(y1+y2)/2, text=text, font=('Arial',8))
-        used, free, frag, largest = self.memory_manager.stats()
-        stats = f"Peor Ajuste | Usado: {used}/{total} ({(used/total*100):.1f}%) | Fragmentación: {frag} | Mayor: {largest}"
+        lo = int(self._view_lo); hi = min(mm.total_memory, int(self._view_lo + span) + 1)
+        if hasattr(mm, "pool_ranges"):
+            return self._draw_pools(mm, vw, cell_h)
+        self._hide_pool_strips()
+        x = lambda u: (u - self._view_lo) * cell_w
+        extents = mm.extents(lo, hi)
+        self._draw_segments(self.canvas, self._strip_pool, self._strip_segments(extents, lo, hi, x, vw),
+                            10, 10+cell_h, labels=True)
+        tree_h = 0
+        if hasattr(mm, "buddy_blocks") and len(extents) <= vw:
+            tree_h = self._draw_buddy_tree(mm.buddy_blocks(lo, hi), lo, hi, x, 16+cell_h)
+        else:
+            for rect in self._tree_pool: self.canvas.itemconfig(rect, state=tk.HIDDEN)
+        self.canvas.config(scrollregion=(0, 0, vw, cell_h+20+tree_h))
+
+    def _strip_segments(self, extents, lo, hi, x, vw):
+        """Segmentos de [lo, hi): uno por bloque y hueco o, si no entran, por columna de píxel"""
+        if len(extents) > vw:
+            columns = max(1, int(vw))
+            return self._column_segments(lo, hi, columns, x(lo), (x(hi) - x(lo)) / columns)
+        segs, pos = [], lo
+        for start, size, owner in extents:
+            a, b = max(start, lo), min(start + size, hi)
+            if a > pos: segs.append((x(pos), x(a), 'white', None))
+            segs.append((x(a), x(b), self._color(owner), owner))
+            pos = b
+        if pos < hi: segs.append((x(pos), x(hi), 'white', None))
+        return segs
+
+    def _draw_pools(self, mm, vw, cell_h, label_h=14, gap=8):
+        """Una tira por pool, apiladas y cada una ajustada al ancho, con sus estadísticas encima"""
+        ranges = mm.pool_ranges()
+        while len(self._pool_strips) < len(ranges):
+            self._pool_strips.append(([], self.canvas.create_text(0,0, anchor=tk.W, font=('Arial',8))))
+        y = 4
+        for (items, label), (name, base, size), st in zip(self._pool_strips, ranges, mm.pool_stats()):
+            self.canvas.coords(label, 4, y + label_h / 2)
+            self.canvas.itemconfig(label, state=tk.NORMAL,
+                                   text=f"{name}: {st.used}/{size} | Fragmentación: {st.fragmentation} | Mayor: {st.largest} | "
+                                        f"Derramados: {st.spilled} | Coste: {st.cost:g}")
+            y += label_h
+            x = lambda u, base=base, px=vw / max(1, size): (u - base) * px
+            segs = self._strip_segments(mm.extents(base, base + size), base, base + size, x, vw)
+            self._draw_segments(self.canvas, items, segs, y, y + cell_h, labels=True)
+            y += cell_h + gap
+        self._hide_pool_strips(len(ranges))
+        self._draw_segments(self.canvas, self._strip_pool, [], 0, 0, labels=True)
+        for rect in self._tree_pool: self.canvas.itemconfig(rect, state=tk.HIDDEN)
+        self.canvas.config(scrollregion=(0, 0, vw, y))
+
+    def _hide_pool_strips(self, start=0):
+        for items, label in self._pool_strips[start:]:
+            self._draw_segments(self.canvas, items, [], 0, 0, labels=True)
+            self.canvas.itemconfig(label, state=tk.HIDDEN)
+
+    def _draw_buddy_tree(self, blocks, lo, hi, x, y0, row_h=10):
+        """Una fila por orden presente (el mayor arriba) con los bloques libres y asignados"""
+        orders = sorted({k for _, k, _ in blocks}, reverse=True)
+        row = {k: i for i, k in enumerate(orders)}
+        while len(self._tree_pool) < len(blocks):
+            self._tree_pool.append(self.canvas.create_rectangle(0,0,0,0, outline='#888'))
+        for rect, (start, k, owner) in zip(self._tree_pool, blocks):
+            y = y0 + row[k] * row_h
+            self.canvas.coords(rect, x(max(start, lo)), y, x(min(start + (1 << k), hi)), y + row_h - 2)
+            self.canvas.itemconfig(rect, fill='#F8F9FA' if owner is None else self._color(owner), state=tk.NORMAL)
+        for rect in self._tree_pool[len(blocks):]: self.canvas.itemconfig(rect, state=tk.HIDDEN)
+        return len(orders) * row_h
+
+    def _draw_minimap(self):
+        """Ocupación de toda la memoria agregada por columna, con la ventana visible marcada"""
+        total = max(1, self.view.total_memory)
+        mw = max(1, self.minimap.winfo_width())
+        h = max(8, int(self.minimap.cget("height") or 16))
+        self._draw_segments(self.minimap, self._map_pool, self._column_segments(0, total, mw), 0, h, labels=False)
+        _, _, span = self._geometry()
+        if self._view_rect is None:
+            self._view_rect = self.minimap.create_rectangle(0,0,0,0, outline='red', width=2)
+        self.minimap.coords(self._view_rect, self._view_lo / total * mw, 1, (self._view_lo + span) / total * mw, h - 1)
+        self.minimap.tag_raise(self._view_rect)
+
+    def _on_xscroll(self, action, value, unit=None):
+        total = max(1, self.view.total_memory)
+        _, _, span = self._geometry()
+        if action == "moveto": self._view_lo = float(value) * total
+        else: self._view_lo += int(value) * (span if unit == "pages" else max(1.0, span / 10))
+        self._layout()
+
+    def _on_minimap_click(self, event):
+        """Centra la ventana visible en la posición pulsada del minimapa"""
+        total = max(1, self.view.total_memory)
+        _, _, span = self._geometry()
+        self._view_lo = event.x / max(1, self.minimap.winfo_width()) * total - span / 2
+        self._layout()
+
+    def _zoom(self, factor, anchor_x=None):
+        """Cambia los píxeles por unidad manteniendo fija la unidad bajo anchor_x"""
+        vw, cell_w, span = self._geometry()
+        anchor_x = vw / 2 if anchor_x is None else anchor_x
+        anchor_u = self._view_lo + anchor_x / cell_w
+        self._cell_w = cell_w * factor
+        _, cell_w, _ = self._geometry()
+        self._view_lo = anchor_u - anchor_x / cell_w
+        self._layout()
+
+    def _zoom_fit(self):
+        self._cell_w = 0
+        self._view_lo = 0.0
+        self._layout()
+
+    def _apply_profiling(self):
+        """Activa o quita la medición del administrador, del dibujo y de los items de canvas"""
+        self.profiler.uninstrument()
+        if self.profile_var.get():
+            instrument_manager(self.profiler, self.memory_manager)
+            self.profiler.instrument(self, ("update_display", "_layout", "_draw_strip", "_draw_minimap"), "gui.")
+            for canvas in (self.canvas, self.minimap):
+                self.profiler.instrument(canvas, ("create_rectangle", "create_text"), counter="canvas.items")
+        elif hasattr(self, "profile_label"):
+            self.profile_label.config(text="")
+
+    def export_profile(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+        if path: self.profiler.export(path)
+
+    def toggle_series(self):
+        """Empieza a grabar la serie de fragmentación en un archivo o termina la grabación en curso"""
+        if self._series is not None:
+            with self._exclusive(): self._series.close()
+            self._series = None
+            self.series_button.config(text="Grabar serie")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("Columnar", "*.col")])
+        if path:
+            with self._exclusive(): self._series = SeriesRecorder(self.memory_manager, open_writer(path))
+            self.series_button.config(text="Detener serie")
+
+    def export_history(self):
+        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Texto", "*.txt")])
+        if path:
+            with self._exclusive(): self.memory_manager.history.export(path)
+
+    def update_display(self):
+        self._paint()
+        mm = self.view
+        total = max(1, mm.total_memory)
+        st = mm.stats()
+        stats = f"{mm.strategy.label} | Usado: {st.used}/{total} ({(st.used/total*100):.1f}%) | Fragmentación: {st.fragmentation} | Mayor: {st.largest}"
+        if hasattr(st, "internal"): stats += f" | Frag. interna: {st.internal}"
+        if hasattr(mm, "mean_cost"): stats += f" | Coste medio: {mm.mean_cost():.2f}"
+        if hasattr(mm, "class_stats"):
+            stats += " | Slabs " + " ".join(f"{c}:{live}/{cap}" for c, (live, cap, _) in mm.class_stats().items())
         self.stats_label.config(text=stats)
+        tl = self.timeline
+        if tl is None:
+            self.step_label.config(text="(sin línea de tiempo)")
+        else:
+            # Con la demo en marcha el hilo mueve la línea de tiempo: se usa la del cuadro
+            position, steps = getattr(mm, "steps", None) or (tl.position, len(tl))
+            self.time_scale.config(to=steps)
+            self.time_scale.set(position)
+            self.step_label.config(text=f"Paso {position}/{steps}" + ("" if position == steps else " (pasado)"))
         self.processes_text.delete(1.0, tk.END)
-        counts = {}
-        for c in self.memory_manager.memory:
-            if c:
-                counts[c] = counts.get(c, 0) + 1
-        for k, v in counts.items(): self.processes_text.insert(tk.END, f"{k}: {v} unidades\n")
+        for n, (_, size, name) in enumerate(islice(self._iter_extents(mm), self.PROCESS_LIST_MAX + 1)):
+            if n == self.PROCESS_LIST_MAX:
+                self.processes_text.insert(tk.END, f"... (+{len(mm.processes) - n} más)\n"); break
+            self.processes_text.insert(tk.END, f"{name}: {size} unidades\n")
         self.history_text.delete(1.0, tk.END)
-        for e in self.memory_manager.history[-12:]: self.history_text.insert(tk.END, e + "\n")
+        for e in mm.history.tail(12): self.history_text.insert(tk.END, e + "\n")
+        if self.profile_var.get():
+            self.profile_label.config(text=" | ".join(self.profiler.top(4)) +
+                                      f" | items canvas: {self.profiler.counters.get('canvas.items', 0)}")
+
+    @staticmethod
+    def _iter_extents(mm, width=256):
+        """Tramos de mm en orden de dirección pidiendo extents() por ventanas: quien corta
+        a los N primeros solo paga las ventanas que recorrió, no toda la memoria"""
+        lo, total = 0, mm.total_memory
+        while lo < total:
+            hi = min(total, lo + width)
+            found = 0
+            for extent in mm.extents(lo, hi):
+                if extent[0] >= lo:  # los que empiezan antes ya salieron en la ventana anterior
+                    found += 1
+                    yield extent
+            # La próxima ventana se ajusta a la densidad vista: más ancha si esta venía rala
+            width = width * 2 if found < 32 else max(256, width // 2)
+            lo = hi
+
+    def on_close(self):
+        """Detiene la demo y vacía la serie en curso antes de destruir los widgets"""
+        if self._worker: self._worker.stop()
+        if self._series is not None: self._series.close()
+        self.root.destroy()
 
     def _on_root_configure(self, event):
-        if event.widget == self.root: self.update_display()
+        if event.widget == self.root: self._schedule_layout()
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,76 @@
+"""Pruebas de equivalencia del índice de huecos contra la referencia de celdas.
+
+Las demás pruebas reutilizan de aquí la carga aleatoria con semilla fija
+(workload) y su aplicación a un administrador (run).
+
+Uso:
+    python -m pytest -q test_allocators.py
+"""
+import random
+
+import pytest
+
+from bench import ListScanMemoryManager
+from memory_manager import MemoryManager
+
+SEEDS = range(5)
+
+
+def workload(seed, ops=400, max_size=20, free_rate=0.4):
+    """Lista de operaciones ("a", nombre, tamaño) / ("f", índice de víctima al azar)"""
+    rng = random.Random(seed)
+    return [("f", rng.random()) if rng.random() < free_rate else ("a", f"P{i}", rng.randint(1, max_size))
+            for i in range(ops)]
+
+
+def run(manager, ops, allocate=None):
+    """Aplica ops y devuelve los inicios de cada asignación; las víctimas se eligen por orden de nombre"""
+    allocate = allocate or manager.allocate
+    starts, live = [], []
+    for op in ops:
+        if op[0] == "a":
+            start = allocate(op[1], op[2])
+            starts.append(start)
+            if start != -1:
+                live.append(op[1])
+        elif live:
+            manager.deallocate_memory(live.pop(int(op[1] * len(live))))
+    return starts
+
+
+def holes(cells):
+    out, start = [], None
+    for i, cell in enumerate(cells + ["#"]):
+        if cell is None and start is None:
+            start = i
+        elif cell is not None and start is not None:
+            out.append((start, i - start))
+            start = None
+    return out
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_worst_fit_matches_list_scan(seed):
+    ops = workload(seed)
+    ref, mm = ListScanMemoryManager(200), MemoryManager(200, "worst")
+    assert run(mm, ops, mm.worst_fit) == run(ref, ops, ref.worst_fit)
+    assert mm.memory == ref.memory
+    assert mm._free_blocks() == ref._free_blocks() == holes(ref.memory)
+    st = mm.stats()
+    assert (st.used, st.fragmentation) == (sum(c is not None for c in ref.memory), len(ref._free_blocks()))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bucket_max_only_for_first_and_next_fit(seed):
+    mm = MemoryManager(5000, "worst")
+    mm.free_index.BUCKET = 4  # cubetas chicas para que se partan y se vacíen
+    ops = workload(seed, ops=1500, max_size=8)
+    run(mm, ops[:700])
+    assert mm.free_index._bmax is None
+    mm.set_strategy("first")
+    run(mm, ops[700:])
+    index = mm.free_index
+    assert index._bmax == [max(index._size[s] for s in bucket) for bucket in index._buckets]
+    blocks = index.blocks()
+    for size in range(1, 12):
+        assert index.first_fit(size) == next(((s, l) for s, l in blocks if l >= size), None)
@@ -0,0 +1,40 @@
+"""Pruebas de allocate_many/free_many contra llamadas sueltas.
+
+Uso:
+    python -m pytest -q test_batch.py
+"""
+import random
+
+import pytest
+
+from replay import make_manager
+from strategies import STRATEGIES
+from test_allocators import SEEDS
+
+
+@pytest.mark.parametrize("key", sorted(STRATEGIES) + ["buddy"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batches_match_sequential_calls(key, seed):
+    a, b = make_manager(256, strategy=key), make_manager(256, strategy=key)
+    notifications = []
+    b.add_listener(notifications.append)
+    rng = random.Random(seed)
+    live, n = [], 0
+    for batch in range(30):
+        sizes = [rng.randint(1, 20) for _ in range(rng.randint(1, 10))]
+        names = [f"P{n + i}" for i in range(len(sizes))]
+        n += len(sizes)
+        before = len(notifications)
+        starts = b.allocate_many(sizes, names)
+        assert starts == [a.allocate(name, size) for name, size in zip(names, sizes)]
+        assert len(notifications) - before <= 1
+        live += [name for name, start in zip(names, starts) if start != -1]
+        rng.shuffle(live)
+        victims, live = live[:len(live) // 2], live[len(live) // 2:]
+        before = len(notifications)
+        b.free_many(victims)
+        for name in victims:
+            a.deallocate_memory(name)
+        assert len(notifications) - before <= 1
+        assert a.extents() == b.extents()
+        assert a.stats() == b.stats()
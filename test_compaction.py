@@ -0,0 +1,43 @@
+"""Pruebas de la compactación y de su planificador.
+
+Uso:
+    python -m pytest -q test_compaction.py
+"""
+import random
+
+import pytest
+
+from buddy import BuddyMemoryManager
+from compaction import _split_plan, plan_compaction
+from memory_manager import MemoryManager
+from test_allocators import run, workload
+
+
+def test_compaction_fills_holes_from_elsewhere():
+    mm = MemoryManager(15)
+    for start, name, size in ((0, "A", 1), (2, "B", 10), (13, "C", 1)):
+        mm.allocate_memory(start, name, size)
+    result = mm.compact()
+    assert (result.blocks, result.units) == (1, 1)
+    assert mm.free_index.blocks() == [(12, 3)]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_compaction_leaves_one_hole(seed):
+    rng = random.Random(seed)
+    mm = MemoryManager(rng.randint(10, 120), "first")
+    run(mm, workload(seed, ops=80, max_size=15))
+    extents, used = mm.extents(), mm.used
+    units = sum(move[3] for move in plan_compaction(extents, mm.total_memory))
+    assert units <= _split_plan(extents, mm.total_memory)[0]
+    assert mm.compact().units == units
+    assert len(mm.free_index.blocks()) <= 1 and mm.used == used
+    assert sorted(owner for _, _, owner in mm.extents()) == sorted(owner for _, _, owner in extents)
+
+
+def test_buddy_never_moves_blocks():
+    mm = BuddyMemoryManager(64)
+    mm.allocate("A", 5)
+    mm.allocate("B", 30)
+    mm.deallocate_memory("A")
+    assert mm.compact().blocks == 0
@@ -0,0 +1,70 @@
+"""Pruebas del historial de eventos y de sus formateadores.
+
+Uso:
+    python -m pytest -q test_history.py
+"""
+import pytest
+
+from history import ALLOC, FAIL, FREE, EventHistory, format_event
+
+
+def test_tail_formats_with_each_event_label():
+    history = EventHistory(10)
+    history.record(ALLOC, "P1", 5, 0, 1)
+    history.label = "Primer Ajuste"
+    history.record(ALLOC, "P2", 3, 5, 1)
+    assert history.tail(2) == [format_event(("alloc", "P1", 5, 0, 1), "Peor Ajuste"),
+                               format_event(("alloc", "P2", 3, 5, 1), "Primer Ajuste")]
+
+
+def test_worst_fit_app_formatter():
+    pytest.importorskip("tkinter")
+    from tempCodeRunnerFile import MemoryManager
+    mm = MemoryManager(10)
+    mm.worst_fit("P1", 4)
+    mm.worst_fit("P2", 20)
+    mm.deallocate_memory("P1")
+    mm.history.append("=== DEMO COMPLETADA ===")
+    assert mm.history.tail(10) == ["✓ Asignado P1 (tamaño 4) en posición 0 - Bloque libre usado: 10",
+                                   "✗ FALLÓ asignar P2 (tamaño 20) - Sin espacio suficiente",
+                                   "🗑️ Liberado proceso P1",
+                                   "=== DEMO COMPLETADA ==="]
+
+
+def spill_run(path, prefix, n):
+    history = EventHistory(3, str(path))
+    for i in range(n):
+        history.record(ALLOC, f"{prefix}P{i}", i + 1, i, 2)
+    history.record(FREE, f"{prefix}P0")
+    return history
+
+
+def test_spill_export_round_trip(tmp_path):
+    spill, out = tmp_path / "volcado.tsv", tmp_path / "historial.txt"
+    history = spill_run(spill, "R0", 6)
+    history.export(str(out))
+    expected = [format_event((ALLOC, f"R0P{i}", i + 1, i, 2)) for i in range(6)] + ["Liberado proceso R0P0"]
+    assert out.read_text(encoding="utf-8").splitlines() == expected
+    history.close()
+
+    # Otra corrida con el mismo archivo no arrastra los eventos de la anterior
+    history = spill_run(spill, "R1", 4)
+    history.export(str(out))
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5 and not any("R0" in line for line in lines)
+
+    history.clear()
+    history.record(FAIL, "R1P9", 7)
+    history.export(str(out))
+    assert out.read_text(encoding="utf-8").splitlines() == ["FALLÓ asignar R1P9 (tamaño 7) - Sin espacio"]
+    history.close()
+
+
+def test_worst_fit_app_frees_only_live_processes():
+    pytest.importorskip("tkinter")
+    from tempCodeRunnerFile import MemoryManager
+    mm = MemoryManager(10)
+    mm.worst_fit("P1", 4)
+    assert mm.deallocate_memory("P1") is True
+    assert mm.deallocate_memory("P1") is False
+    assert len(mm.history) == 2
@@ -0,0 +1,33 @@
+"""Pruebas del modo NumPy contra el administrador de tramos.
+
+Uso:
+    python -m pytest -q test_numpy_manager.py
+"""
+import pytest
+
+from replay import make_manager
+from strategies import STRATEGIES
+from test_allocators import SEEDS, run, workload
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("key", sorted(STRATEGIES))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_numpy_backend_matches_extents(key, seed):
+    ops = workload(seed)
+    a, b = make_manager(300, "extents", key), make_manager(300, "numpy", key)
+    assert run(a, ops) == run(b, ops)
+    assert a.extents() == b.extents()
+    assert a.stats() == b.stats()
+    assert a.memory == b.memory
+
+
+def test_owner_ids_are_reused():
+    mm = make_manager(100, "numpy", "first")
+    for i in range(10000):
+        mm.allocate(f"P{i}", 3)
+        if i >= 5:
+            mm.deallocate_memory(f"P{i - 5}")
+    assert mm.owners.max() <= 6
+    assert sorted(name for _, _, name in mm.extents()) == [f"P{i}" for i in range(9995, 10000)]
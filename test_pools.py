@@ -0,0 +1,62 @@
+"""Pruebas de la memoria repartida en pools.
+
+Uso:
+    python -m pytest -q test_pools.py
+"""
+from history import COMPACT
+from pools import PooledMemoryManager, parse_pools
+
+POOLS = [("rapida", 10, 4, 1.0), ("lenta", 20, None, 4.0)]
+
+
+def test_tier_placement_spills_to_the_next_pool():
+    mm = PooledMemoryManager(POOLS, "tier", "first")
+    assert mm.allocate("A", 8) == 0
+    assert mm.allocate("B", 5) == 10  # no entra en rápida: se derrama a lenta
+    stats = {p.name: p for p in mm.pool_stats()}
+    assert (stats["rapida"].allocated, stats["lenta"].allocated, stats["lenta"].spilled) == (1, 1, 1)
+    assert mm.extents() == [(0, 8, "A"), (10, 5, "B")]
+    assert mm.mean_cost() == (8 * 1.0 + 5 * 4.0) / 13
+
+
+def test_without_spill_the_preferred_pool_fails():
+    mm = PooledMemoryManager(POOLS, "tier", "first", spill=False)
+    mm.allocate("A", 8)
+    assert mm.allocate("B", 5) == -1 and not mm.can_fit(5)
+    assert mm.pool_stats()[0].failed == 1
+
+
+def test_size_placement_sends_large_requests_to_their_pool():
+    mm = PooledMemoryManager(POOLS, "size", "first")
+    assert mm.allocate("small", 3) == 0
+    assert mm.allocate("large", 6) == 10
+    assert mm.pool_stats()[1].spilled == 0
+
+
+def test_affinity_placement_honours_the_hint():
+    mm = PooledMemoryManager(POOLS, "affinity", "first")
+    assert mm.allocate("A", 2, pool="lenta") == 10
+    assert mm.allocate("B", 2) == 0
+    assert mm.allocate("C", 25, pool="lenta") == -1
+    assert mm.pool_stats()[1].failed == 1
+
+
+def test_free_and_compact_keep_blocks_in_their_pool():
+    mm = PooledMemoryManager(POOLS, "tier", "first")
+    for name in "ABCDE":
+        mm.allocate(name, 2)
+    mm.allocate("F", 6)
+    mm.deallocate_memory("A")
+    mm.deallocate_memory("C")
+    assert not mm.deallocate_memory("C")
+    notifications = []
+    mm.add_listener(notifications.append)
+    result = mm.compact()
+    assert len(notifications) == 1 and (result.blocks, result.units) == (1, 2)
+    assert [e.op for e in mm.history][-1] == COMPACT
+    assert mm.extents() == [(0, 2, "B"), (6, 2, "D"), (8, 2, "E"), (10, 6, "F")]
+    assert sorted(mm.active_processes()) == ["B", "D", "E", "F"]
+
+
+def test_parse_pools():
+    assert parse_pools(["rapida:200:8:1", "lenta:800::4"]) == [("rapida", 200, 8, 1.0), ("lenta", 800, None, 4.0)]
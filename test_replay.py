@@ -0,0 +1,56 @@
+"""Pruebas de la reproducción de trazas.
+
+Uso:
+    python -m pytest -q test_replay.py
+"""
+import json
+
+import pytest
+
+import replay
+from replay import ALLOC, FREE, make_manager, open_trace, write_binary
+
+TRACE = """# traza de prueba
+a P1 4
+a P2 3
+a P1 2
+f P2
+f P2
+f P9
+a P3 20
+a P2 1
+"""
+
+
+@pytest.mark.parametrize("strategy", ["worst", "buddy"])
+def test_duplicates_and_stray_frees_are_counted(strategy):
+    events = list(replay.read_text(TRACE.splitlines()))
+    report = replay.replay(events, make_manager(16, strategy=strategy))
+    assert (report["events"], report["allocated"], report["failed"], report["freed"]) == (8, 3, 1, 1)
+    assert (report["duplicates"], report["first_duplicate"], report["stray_frees"]) == (1, 2, 2)
+    text = replay.format_report(report)
+    assert "Duplicados: 1 (el primero en el evento 2)" in text and "Liberaciones sin proceso: 2" in text
+
+
+def test_clean_report_omits_error_counts():
+    report = replay.replay([(ALLOC, "P1", 3), (FREE, "P1", 0)], make_manager(10))
+    assert (report["allocated"], report["freed"], report["duplicates"], report["stray_frees"]) == (1, 1, 0, 0)
+    assert "Duplicados" not in replay.format_report(report)
+
+
+def test_binary_trace_round_trip(tmp_path):
+    events = list(replay.read_text(TRACE.splitlines()))
+    path = tmp_path / "traza.bin"
+    with open(path, "wb") as f:
+        write_binary(events, f)
+    f, read = open_trace(str(path))
+    with f:
+        assert list(read) == events
+
+
+def test_cli_json_report(tmp_path, capsys):
+    path = tmp_path / "traza.txt"
+    path.write_text(TRACE, encoding="utf-8")
+    assert replay.main([str(path), "--memory", "16", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["freed"], report["stray_frees"], report["used"]) == (1, 2, 5)
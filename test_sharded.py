@@ -0,0 +1,49 @@
+"""Pruebas del administrador repartido en arenas.
+
+Uso:
+    python -m pytest -q test_sharded.py
+"""
+import threading
+
+from sharded import ShardedMemoryManager, stress
+
+
+def test_arenas_split_memory_and_steal_when_full():
+    mm = ShardedMemoryManager(10, arenas=3)
+    assert [a.manager.total_memory for a in mm.arenas] == [4, 3, 3]
+    assert mm.allocate("A", 4) == 0
+    assert mm.allocate("B", 3) == 4  # la arena propia está llena: roba de la siguiente
+    assert mm.allocate("C", 5) == -1  # ninguna arena tiene 5 seguidos
+    rows = mm.arena_stats()
+    assert (rows[1].stolen, rows[2].failed) == (1, 1)
+    assert mm.deallocate_memory("B") and not mm.deallocate_memory("B")
+    assert mm.extents() == [(0, 4, "A")]
+
+
+def test_without_steal_requests_stay_home():
+    mm = ShardedMemoryManager(10, arenas=2, steal=False)
+    assert mm.allocate("A", 5) == 0
+    assert mm.allocate("B", 1) == -1
+    assert mm.contention()["failed"] == 1
+
+
+def test_each_thread_gets_its_own_home():
+    mm = ShardedMemoryManager(100, arenas=4)
+    starts = {}
+
+    def worker(tid):
+        starts[tid] = mm.allocate(f"T{tid}", 5)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(starts.values()) == [0, 25, 50, 75]
+
+
+def test_stress_accounts_every_allocation():
+    row = stress(2000, arenas=4, threads=4, ops=2000, seed=1)
+    assert row["ops"] == 8000 and row["allocated"] > 0
+    assert row["acquired"] >= row["allocated"]
+    assert 0 <= row["used"] <= 2000
@@ -0,0 +1,45 @@
+"""Pruebas de la simulación de eventos discretos.
+
+Uso:
+    python -m pytest -q test_simulation.py
+"""
+import pytest
+
+from replay import make_manager
+from simulation import Simulation
+from workload import arrivals
+
+# (llegada, nombre, tamaño, duración)
+ARRIVALS = [(0.0, "A", 6, 10.0), (1.0, "B", 6, 2.0), (2.0, "C", 2, 1.0), (3.0, "D", 4, 1.0)]
+
+
+def test_waiting_requests_start_in_fifo_order():
+    sim = Simulation(make_manager(10), ARRIVALS)
+    report = sim.run()
+    assert (report["arrived"], report["started"], report["rejected"], report["finished"]) == (4, 4, 0, 4)
+    # B espera a A (hasta 10); C y D no se adelantan aunque quepan
+    assert report["wait_max"] == 9.0 and report["queue_max"] == 3
+    assert report["time"] == 12.0 and report["waiting"] == 0
+
+
+def test_without_queue_requests_are_rejected():
+    report = Simulation(make_manager(10), ARRIVALS, wait=False).run()
+    assert (report["started"], report["rejected"], report["queue_max"]) == (3, 1, 0)
+
+
+@pytest.mark.parametrize("strategy", ["worst", "buddy"])
+def test_requests_larger_than_memory_never_block_the_queue(strategy):
+    sim = Simulation(make_manager(16, strategy=strategy), [(0.0, "A", 10, 5.0), (1.0, "X", 40, 1.0),
+                                                           (2.0, "B", 10, 1.0)])
+    report = sim.run()
+    assert (report["started"], report["rejected"], report["waiting"]) == (2, 1, 0)
+
+
+def test_run_until_and_samples():
+    sim = Simulation(make_manager(1000, history_size=0), arrivals("uniform:1-20", "exp:30", 1.0, 0, 500),
+                     sample_interval=10.0)
+    report = sim.run(until=100.0)
+    assert sim.now == 100.0 and report["arrived"] < 500
+    assert [s.time for s in sim.samples] == [10.0 * i for i in range(11)]
+    assert all(0.0 <= s.utilization <= 1.0 for s in sim.samples)
+    assert sim.run()["finished"] == 500
@@ -0,0 +1,55 @@
+"""Pruebas de la capa de slabs.
+
+Uso:
+    python -m pytest -q test_slab.py
+"""
+from history import ALLOC, FAIL
+from memory_manager import MemoryManager
+from slab import SlabAllocator
+
+
+def test_small_objects_share_a_slab():
+    mm = MemoryManager(100, "first")
+    slabs = SlabAllocator(mm, classes=(2,), objects_per_slab=4)
+    assert [slabs.allocate(f"O{i}", 2) for i in range(5)] == [0, 2, 4, 6, 8]
+    assert [owner for _, _, owner in mm.extents()] == ["slab2#1", "slab2#2"]
+    assert slabs.class_stats() == {2: (5, 8, 2)}
+    assert slabs.extents(0, 5) == [(0, 2, "O0"), (2, 2, "O1"), (4, 2, "O2")]
+    assert slabs.allocate("big", 7) == 16
+    assert slabs.processes["big"] == (16, 7)
+
+
+def test_freed_objects_return_empty_slabs():
+    mm = MemoryManager(100, "first")
+    slabs = SlabAllocator(mm, classes=(2,), objects_per_slab=2)
+    for i in range(4):
+        slabs.allocate(f"O{i}", 2)
+    assert slabs.deallocate_memory("O0") and slabs.deallocate_memory("O1")
+    assert not slabs.deallocate_memory("O1")
+    # El último slab parcial de la clase se conserva vacío
+    assert [owner for _, _, owner in mm.extents()] == ["slab2#1", "slab2#2"]
+    slabs.deallocate_memory("O2")
+    slabs.deallocate_memory("O3")
+    assert [owner for _, _, owner in mm.extents()] == ["slab2#1"]
+    assert slabs.class_stats() == {2: (0, 2, 1)}
+    assert slabs.active_processes() == []
+
+
+def test_object_goes_loose_when_a_slab_does_not_fit():
+    mm = MemoryManager(10, "first")
+    slabs = SlabAllocator(mm, classes=(2,), objects_per_slab=8)
+    slabs.allocate("big", 4)
+    assert slabs.allocate("O1", 2) == 4
+    assert [owner for _, _, owner in mm.extents()] == ["big", "O1"]
+    assert slabs.class_stats() == {2: (0, 0, 0)}
+    assert slabs.deallocate_memory("O1") and "O1" not in mm.processes
+
+
+def test_failed_request_records_one_fail():
+    mm = MemoryManager(10, "first")
+    slabs = SlabAllocator(mm, classes=(2,), objects_per_slab=8)
+    slabs.allocate("big", 9)
+    before = len(mm.history)
+    assert slabs.allocate("O1", 2) == -1
+    assert [event.op for event in list(mm.history)[before:]] == [FAIL]
+    assert list(mm.history)[0].op == ALLOC
@@ -0,0 +1,39 @@
+"""Pruebas de las instantáneas binarias.
+
+Uso:
+    python -m pytest -q test_snapshot.py
+"""
+import pytest
+
+import snapshot
+from replay import make_manager
+from test_allocators import run, workload
+
+
+@pytest.mark.parametrize("backend,key", [("extents", "worst"), ("extents", "next"), ("numpy", "best"),
+                                         ("extents", "buddy")])
+def test_snapshot_round_trip(tmp_path, backend, key):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    ops = workload(1, ops=600)
+    original = make_manager(300, backend, key)
+    run(original, ops[:300])
+    original.compact()
+    path = tmp_path / "estado.snap"
+    snapshot.save(original, str(path))
+    restored = snapshot.load(str(path))
+    assert type(restored) is type(original)
+    assert restored.extents() == original.extents()
+    assert restored.stats() == original.stats()
+    assert restored.active_processes() == original.active_processes()
+    assert restored.compactions == original.compactions
+    # Reanudar desde la instantánea da lo mismo que seguir sin cortar
+    assert run(restored, ops[300:]) == run(original, ops[300:])
+    assert restored.extents() == original.extents()
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "otro.bin"
+    path.write_bytes(b"no es una instantanea" * 10)
+    with pytest.raises(ValueError):
+        snapshot.load(str(path))
@@ -0,0 +1,44 @@
+"""Pruebas de la línea de tiempo reversible.
+
+Uso:
+    python -m pytest -q test_timeline.py
+"""
+import random
+
+import pytest
+
+from memory_manager import MemoryManager
+from test_allocators import SEEDS, holes, run, workload
+from timeline import Timeline
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_timeline_seek_restores_every_step(seed):
+    mm = MemoryManager(300, "first")
+    timeline = Timeline(mm)
+    states = [mm.extents()]
+    mm.add_listener(lambda changes: states.append(mm.extents()))
+    ops = workload(seed, ops=300)
+    for i in range(0, len(ops), 50):
+        run(mm, ops[i:i + 50])
+        mm.compact()
+    assert len(states) == len(timeline) + 1
+    rng = random.Random(seed)
+    for position in [0, len(timeline)] + [rng.randrange(len(timeline) + 1) for _ in range(20)]:
+        timeline.seek(position)
+        assert mm.extents() == states[position]
+        assert mm.used == sum(size for _, size, _ in states[position])
+    timeline.seek(len(timeline))
+    assert timeline.live and mm.free_index.blocks() == holes(mm.memory)
+
+
+def test_bounded_timeline_forgets_oldest_steps():
+    mm = MemoryManager(50)
+    timeline = Timeline(mm, maxlen=3)
+    for i in range(5):
+        mm.allocate(f"P{i}", 2)
+    assert (len(timeline), timeline.position) == (3, 3)
+    timeline.seek(0)
+    assert [name for _, _, name in mm.extents()] == ["P0", "P1"]
+    timeline.seek(3)
+    assert len(mm.extents()) == 5
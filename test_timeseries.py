@@ -0,0 +1,54 @@
+"""Pruebas de las series de fragmentación.
+
+Uso:
+    python -m pytest -q test_timeseries.py
+"""
+import csv
+
+import pytest
+
+import replay
+from memory_manager import MemoryManager
+from timeseries import COLUMNS, SeriesRecorder, open_writer, read_columnar
+
+
+def record(path, every):
+    mm = MemoryManager(20, "first")
+    recorder = SeriesRecorder(mm, open_writer(str(path), **({"buffer_rows": 2} if path.suffix == ".csv"
+                                                             else {"group_rows": 2})), every)
+    for name, size in (("A", 8), ("B", 8), ("C", 8), ("D", 4)):
+        mm.allocate(name, size)
+    mm.deallocate_memory("A")
+    mm.allocate("E", 10)
+    recorder.close()
+
+
+def test_csv_and_columnar_series_match(tmp_path):
+    record(tmp_path / "serie.csv", 1)
+    record(tmp_path / "serie.col", 1)
+    with open(tmp_path / "serie.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == [name for name, _ in COLUMNS]
+    columns = [value for group in read_columnar(str(tmp_path / "serie.col"))
+               for value in zip(*(group[name] for name, _ in COLUMNS))]
+    assert [[float(v) for v in row] for row in rows[1:]] == [[float(v) for v in row] for row in columns]
+    # op, used, free_blocks, largest, fail_rate de cada operación
+    assert [(r[0], r[1], r[3], r[4], r[6]) for r in columns] == [
+        (1, 8, 1, 12, 0.0), (2, 16, 1, 4, 0.0), (3, 16, 1, 4, 1.0), (4, 20, 0, 0, 0.0),
+        (5, 12, 1, 8, 0.0), (6, 12, 1, 8, 1.0)]
+
+
+def test_series_every_n_operations(tmp_path):
+    record(tmp_path / "serie.col", 4)
+    rows = [row for group in read_columnar(str(tmp_path / "serie.col")) for row in zip(*group.values())]
+    assert [row[0] for row in rows] == [4]
+    assert rows[0][6] == 0.25  # una fallida de cuatro intentos
+
+
+def test_series_every_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        SeriesRecorder(MemoryManager(10), open_writer(str(tmp_path / "serie.csv")), 0)
+    trace = tmp_path / "traza.txt"
+    trace.write_text("a P1 3\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        replay.main([str(trace), "--series", str(tmp_path / "s.csv"), "--series-every", "0"])
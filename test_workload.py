@@ -0,0 +1,52 @@
+"""Pruebas del generador de cargas sintéticas.
+
+Uso:
+    python -m pytest -q test_workload.py
+"""
+import itertools
+import random
+
+import pytest
+
+import workload
+from workload import ALLOC, FREE
+
+
+def test_events_are_timed_and_balanced():
+    events = list(workload.timed_events("uniform:1-8", "exp:5", rate=2.0, seed=3, count=500))
+    assert [t for t, *_ in events] == sorted(t for t, *_ in events)
+    allocs = [name for _, op, name, _ in events if op == ALLOC]
+    frees = [name for _, op, name, _ in events if op == FREE]
+    assert len(allocs) == 500 and sorted(frees) == sorted(allocs)
+    live = set()
+    for _, op, name, size in events:
+        if op == ALLOC:
+            assert 1 <= size <= 8
+            live.add(name)
+        else:
+            live.remove(name)
+
+
+def test_same_seed_same_stream():
+    a = list(workload.events("bimodal:1-4,40-80,0.9", "exp:20", seed=7, count=200))
+    assert a == list(workload.events("bimodal:1-4,40-80,0.9", "exp:20", seed=7, count=200))
+    assert a != list(workload.events("bimodal:1-4,40-80,0.9", "exp:20", seed=8, count=200))
+
+
+def test_infinite_stream_is_lazy():
+    head = list(itertools.islice(workload.events(count=None), 1000))
+    assert len(head) == 1000
+
+
+def test_samplers(tmp_path):
+    rng = random.Random(0)
+    assert {workload.size_sampler("fixed:5", rng)() for _ in range(10)} == {5}
+    assert {workload.size_sampler("uniform:2-3", rng)() for _ in range(100)} == {2, 3}
+    assert min(workload.size_sampler("exp:2", rng)() for _ in range(100)) >= 1
+    trace = tmp_path / "traza.txt"
+    trace.write_text("a P1 3\na P2 7\nf P1\na P3 7\n", encoding="utf-8")
+    sample = workload.size_sampler(f"trace:{trace}", rng)
+    values = [sample() for _ in range(1000)]
+    assert set(values) == {3, 7} and values.count(7) > values.count(3)
+    with pytest.raises(ValueError):
+        workload.size_sampler("normal:3", rng)
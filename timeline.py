@@ -0,0 +1,80 @@
+"""Línea de tiempo reversible de un MemoryManager.
+
+Cada notificación del administrador (la lista de cambios de una operación)
+se guarda como un paso: tramos agregados ("alloc") o quitados ("free").
+Retroceder aplica los cambios del paso al revés y en orden inverso, avanzar
+los vuelve a aplicar, así que cada salto cuesta O(tramos cambiados) y no una
+reproducción desde el principio. Los cambios se aplican con _place/_unplace,
+sin pasar por las estrategias ni el historial, y se notifican a los demás
+listeners para que la vista se actualice.
+
+Una operación nueva hecha en el pasado descarta los pasos posteriores, como
+deshacer/rehacer. Con ``maxlen`` se olvidan los pasos más viejos.
+"""
+from collections import deque
+
+
+class Timeline:
+    def __init__(self, manager, maxlen=None):
+        self.manager = manager
+        self._steps = deque(maxlen=maxlen)  # cada paso: tupla de (op, start, size, owner)
+        self.position = 0                   # pasos aplicados (== len(self) en vivo)
+        self._replaying = False
+        manager.add_listener(self._record)
+
+    def __len__(self):
+        return len(self._steps)
+
+    @property
+    def live(self):
+        return self.position == len(self._steps)
+
+    def _record(self, changes):
+        if self._replaying:
+            return
+        while len(self._steps) > self.position:  # se reescribe la historia desde aquí
+            self._steps.pop()
+        full = len(self._steps) == self._steps.maxlen
+        self._steps.append(tuple(changes))
+        if not full:
+            self.position += 1
+
+    def _apply(self, changes, undo):
+        manager = self.manager
+        done = []
+        for op, start, size, owner in reversed(changes) if undo else changes:
+            if (op == "alloc") != undo:
+                manager._place(start, owner, size)
+                done.append(("alloc", start, size, owner))
+            else:
+                manager._unplace(owner)
+                done.append(("free", start, size, owner))
+        self._replaying = True
+        try:
+            manager._notify(done)
+        finally:
+            self._replaying = False
+
+    def back(self):
+        """Deshace un paso; devuelve False si ya está en el principio"""
+        if self.position == 0:
+            return False
+        self.position -= 1
+        self._apply(self._steps[self.position], undo=True)
+        return True
+
+    def forward(self):
+        """Rehace un paso; devuelve False si ya está en vivo"""
+        if self.live:
+            return False
+        self._apply(self._steps[self.position], undo=False)
+        self.position += 1
+        return True
+
+    def seek(self, position):
+        """Salta al paso position recorriendo solo los pasos intermedios"""
+        position = max(0, min(position, len(self._steps)))
+        while self.position > position:
+            self.back()
+        while self.position < position:
+            self.forward()
@@ -0,0 +1,174 @@
+"""Series de tiempo de fragmentación en streaming.
+
+SeriesRecorder escucha el historial del administrador (que ve también las
+asignaciones fallidas) y cada ``every`` operaciones escribe una muestra:
+
+    op            operaciones registradas hasta la muestra
+    used          unidades asignadas
+    utilization   used / total
+    free_blocks   número de huecos
+    largest       mayor hueco
+    ext_frag      fragmentación externa, 1 - largest / libre (0 sin memoria libre)
+    fail_rate     fallidas / intentos de asignación desde la muestra anterior
+
+Las muestras van a un escritor con buffer de tamaño fijo: CSV o un formato
+binario columnar por grupos de filas. La memoria usada no crece con la
+longitud de la corrida.
+
+Formato columnar: MAGIC, un uint32 con el largo de la cabecera JSON
+(columnas y tipos 'q'/'d') y la cabecera; después grupos de filas, cada uno
+un uint32 con el número de filas seguido de cada columna completa en
+little-endian.
+
+Uso:
+    python replay.py traza.bin --memory 1000000 --series serie.col --series-every 1000
+    python timeseries.py serie.col            convierte a CSV por stdout
+"""
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from history import ALLOC, FAIL, FREE
+
+COLUMNS = (("op", "q"), ("used", "q"), ("utilization", "d"), ("free_blocks", "q"),
+           ("largest", "q"), ("ext_frag", "d"), ("fail_rate", "d"))
+MAGIC = b"MSERIE1\n"
+COUNT = struct.Struct("<I")
+
+if sys.byteorder != "little":  # las columnas se escriben con array, en orden nativo
+    raise ImportError("timeseries.py requiere una plataforma little-endian")
+
+
+class CsvSeriesWriter:
+    def __init__(self, path, buffer_rows=4096):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow([name for name, _ in COLUMNS])
+        self._rows = []
+        self.buffer_rows = buffer_rows
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        self._csv.writerows(self._rows)
+        self._rows.clear()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ColumnarSeriesWriter:
+    def __init__(self, path, group_rows=65536):
+        self._file = open(path, "wb")
+        header = json.dumps({"columns": [list(c) for c in COLUMNS]}).encode()
+        self._file.write(MAGIC + COUNT.pack(len(header)) + header)
+        self._columns = [array(kind) for _, kind in COLUMNS]
+        self.group_rows = group_rows
+
+    def write(self, row):
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._columns[0]) >= self.group_rows:
+            self.flush()
+
+    def flush(self):
+        n = len(self._columns[0])
+        if n:
+            self._file.write(COUNT.pack(n))
+            for column in self._columns:
+                self._file.write(column.tobytes())
+                del column[:]
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def open_writer(path, **kwargs):
+    """Escritor CSV si la extensión es .csv; si no, columnar"""
+    return (CsvSeriesWriter if path.endswith(".csv") else ColumnarSeriesWriter)(path, **kwargs)
+
+
+def read_columnar(path):
+    """Genera un dict columna -> array por cada grupo de filas"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es una serie columnar")
+        size, = COUNT.unpack(f.read(COUNT.size))
+        columns = json.loads(f.read(size))["columns"]
+        while True:
+            head = f.read(COUNT.size)
+            if not head:
+                return
+            n, = COUNT.unpack(head)
+            group = {}
+            for name, kind in columns:
+                values = array(kind)
+                values.frombytes(f.read(n * values.itemsize))
+                group[name] = values
+            yield group
+
+
+class SeriesRecorder:
+    """Escribe una muestra cada ``every`` operaciones de manager en writer"""
+
+    def __init__(self, manager, writer, every=1):
+        if every < 1:
+            raise ValueError("every debe ser al menos 1")
+        self.manager = manager
+        self.writer = writer
+        self.every = every
+        self.ops = 0
+        self._attempts = self._failures = 0  # desde la muestra anterior
+        manager.history.listeners.append(self._on_event)
+
+    def _on_event(self, op, *_):
+        if op == ALLOC:
+            self._attempts += 1
+        elif op == FAIL:
+            self._attempts += 1
+            self._failures += 1
+        elif op != FREE:
+            return
+        self.ops += 1
+        if self.ops % self.every == 0:
+            self.sample()
+
+    def sample(self):
+        st = self.manager.stats()
+        total = self.manager.total_memory
+        free = st.free
+        self.writer.write((self.ops, st.used, st.used / total if total else 0.0, st.fragmentation, st.largest,
+                           1 - st.largest / free if free else 0.0,
+                           self._failures / self._attempts if self._attempts else 0.0))
+        self._attempts = self._failures = 0
+
+    def close(self):
+        """Deja de escuchar y cierra el escritor"""
+        if self._on_event in self.manager.history.listeners:
+            self.manager.history.listeners.remove(self._on_event)
+        self.writer.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Uso: python timeseries.py serie.col", file=sys.stderr)
+        return 2
+    out = csv.writer(sys.stdout)
+    out.writerow([name for name, _ in COLUMNS])
+    for group in read_columnar(argv[0]):
+        out.writerows(zip(*(group[name] for name, _ in COLUMNS)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Ejecución de demos en un hilo aparte con publicación de cuadros.
+
+El hilo de trabajo llama al paso de la demo tan rápido como permita la
+velocidad elegida y, como mucho ``fps`` veces por segundo, publica un
+FrozenView: una copia inmutable de lo que la interfaz necesita para dibujar.
+El hilo de Tk solo lee el último cuadro publicado, así que la velocidad de la
+simulación no depende de la de dibujo y la ventana sigue respondiendo aunque
+la demo corra sin pausas.
+"""
+import threading
+import time
+from bisect import bisect_right
+
+from memory_manager import MemoryManager
+
+
+class _HistoryTail:
+    def __init__(self, lines):
+        self._lines = lines
+
+    def tail(self, n):
+        return self._lines[-n:] if n else []
+
+
+class FrozenView:
+    """Copia de solo lectura del estado de un administrador con su interfaz de consulta"""
+
+    # Se calculan a partir de extents() igual que en el administrador
+    cells = MemoryManager.cells
+    occupancy = MemoryManager.occupancy
+
+    def __init__(self, manager, dirty=(), info=None, history_lines=12, timeline=None):
+        self.total_memory = manager.total_memory
+        self.strategy = manager.strategy
+        self._extents = manager.extents()
+        self._starts = [s for s, _, _ in self._extents]
+        self._stats = manager.stats()
+        self.history = _HistoryTail(manager.history.tail(history_lines))
+        self.processes = range(len(manager.processes))  # solo se consulta su tamaño
+        if hasattr(manager, "class_stats"):
+            self._class_stats = manager.class_stats()
+            self.class_stats = lambda: self._class_stats
+        if hasattr(manager, "buddy_blocks"):
+            self._buddy = manager.buddy_blocks()
+            self.buddy_blocks = self._buddy_blocks
+        if hasattr(manager, "pool_ranges"):
+            self._pools = manager.pool_ranges(), manager.pool_stats(), manager.mean_cost()
+            self.pool_ranges = lambda: self._pools[0]
+            self.pool_stats = lambda: self._pools[1]
+            self.mean_cost = lambda: self._pools[2]
+        # (posición, pasos) de la línea de tiempo en el momento del cuadro
+        self.steps = (timeline.position, len(timeline)) if timeline is not None else None
+        self.dirty = list(dirty)  # tramos (start, size) cambiados desde el cuadro anterior
+        self.info = info
+
+    def stats(self):
+        return self._stats
+
+    def extents(self, lo=0, hi=None):
+        hi = self.total_memory if hi is None else hi
+        i = max(bisect_right(self._starts, lo) - 1, 0)
+        j = bisect_right(self._starts, hi - 1)
+        return [e for e in self._extents[i:j] if e[0] + e[1] > lo]
+
+    def _buddy_blocks(self, lo=0, hi=None):
+        hi = self.total_memory if hi is None else hi
+        return [b for b in self._buddy if b[0] < hi and b[0] + (1 << b[1]) > lo]
+
+
+class DemoWorker:
+    """Hilo que repite step() hasta que devuelva False o se detenga.
+
+    ``delay`` son los segundos entre pasos (0 = máximo rendimiento) y puede
+    cambiarse en marcha. ``status`` devuelve el texto de estado que acompaña
+    a cada cuadro. Mientras se tiene ``lock`` el hilo no ejecuta pasos. Con
+    ``timeline`` cada cuadro lleva también su posición.
+    """
+
+    def __init__(self, manager, step, delay=0.8, fps=30, status=None, timeline=None):
+        self.manager = manager
+        self.timeline = timeline
+        self.step = step
+        self._wake = threading.Event()  # corta la espera entre pasos
+        self.delay = delay
+        self.interval = 1 / fps
+        self.status = status
+        self.lock = threading.Lock()
+        self.frame = None   # último FrozenView publicado
+        self.frames = 0     # cuadros publicados
+        self.steps = 0
+        self.done = False
+        self.error = None   # excepción que terminó el hilo, si la hubo
+        self._dirty = []
+        self._run = threading.Event()
+        self._run.set()
+        self._stop = threading.Event()
+        manager.add_listener(self._on_change)
+        self._thread = threading.Thread(target=self._loop, name="demo", daemon=True)
+
+    def start(self):
+        self._publish()
+        self._thread.start()
+        return self
+
+    def _on_change(self, changes):
+        self._dirty.extend((start, size) for _, start, size, _ in changes)
+
+    def _publish(self):
+        dirty, self._dirty = self._dirty, []
+        frame = FrozenView(self.manager, dirty, self.status() if self.status else None, timeline=self.timeline)
+        self.frames += 1
+        frame.seq = self.frames
+        self.frame = frame
+        self._last = time.perf_counter()
+
+    def _loop(self):
+        try:
+            while not self._stop.is_set():
+                self._run.wait()
+                with self.lock:
+                    if self._stop.is_set() or not self._run.is_set():
+                        continue
+                    if not self.step():
+                        break
+                    self.steps += 1
+                    if time.perf_counter() - self._last >= self.interval:
+                        self._publish()
+                if self._delay:
+                    self._wake.wait(self._delay)
+                    self._wake.clear()
+        except Exception as exc:
+            self.error = exc
+        finally:
+            with self.lock:
+                self.manager.listeners.remove(self._on_change)
+                self._publish()
+                self.done = True
+
+    @property
+    def delay(self):
+        return self._delay
+
+    @delay.setter
+    def delay(self, seconds):
+        self._delay = seconds
+        self._wake.set()  # la nueva velocidad rige desde ya, sin esperar la pausa anterior
+
+    @property
+    def paused(self):
+        return not self._run.is_set()
+
+    def pause(self):
+        """Detiene los pasos; al volver, el paso en curso ya terminó"""
+        self._run.clear()
+        with self.lock:
+            pass
+
+    def resume(self):
+        """Reanuda; antes publica un cuadro con el estado actual (pudo cambiar en la pausa)"""
+        with self.lock:
+            self._dirty.clear()
+            self._publish()
+        self._run.set()
+
+    def stop(self):
+        self._stop.set()
+        self._run.set()
+        self._wake.set()
+        self._thread.join()
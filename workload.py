@@ -0,0 +1,144 @@
+"""Generador de cargas sintéticas en streaming.
+
+Las llegadas siguen un proceso de Poisson de tasa ``rate`` (llegadas por
+unidad de tiempo); cada petición sortea un tamaño y un tiempo de vida, y al
+cumplirse se emite su liberación. Los eventos se generan de a uno: solo se
+guardan en memoria las liberaciones pendientes (los procesos vivos), así que
+la carga puede ser de miles de millones de eventos o infinita.
+
+Distribuciones (tamaños y tiempos de vida):
+    uniform:1-20            uniforme entre 1 y 20
+    exp:8                   exponencial de media 8
+    bimodal:1-4,40-80,0.9   90% entre 1 y 4, el resto entre 40 y 80
+    fixed:5                 siempre 5
+    trace:traza.bin         tamaños con la frecuencia observada en una traza
+
+Uso:
+    python workload.py --sizes exp:8 --lifetimes exp:200 --events 1000000000 --memory 100000
+    python workload.py --sizes trace:real.txt --events 1000000 --out sintetica.bin
+"""
+import argparse
+import heapq
+import itertools
+import random
+import sys
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+
+ALLOC, FREE = 0, 1  # mismos códigos que las trazas de replay.py
+
+
+@lru_cache(maxsize=None)
+def trace_histogram(path):
+    """Cuenta los tamaños de las asignaciones de una traza sin cargarla entera.
+
+    Se lee una sola vez por proceso (un barrido pide la misma traza en cada
+    configuración); el Counter devuelto es compartido, no modificarlo.
+    """
+    from replay import open_trace
+    f, events = open_trace(path)
+    with f:
+        counts = Counter(size for op, _, size in events if op == ALLOC)
+    if not counts:
+        raise ValueError(f"La traza {path} no tiene asignaciones")
+    return counts
+
+
+def sampler(spec, rng, integer=True):
+    """Devuelve una función sin argumentos que sortea valores según spec.
+
+    Con integer=True los valores son enteros >= 1 (tamaños); si no, números
+    reales (tiempos de vida).
+    """
+    kind, _, args = spec.partition(":")
+    if kind == "uniform":
+        lo, hi = map(int, args.split("-"))
+        return (lambda: rng.randint(lo, hi)) if integer else (lambda: rng.uniform(lo, hi))
+    if kind == "exp":
+        rate = 1 / float(args)
+        return (lambda: max(1, int(rng.expovariate(rate)))) if integer else (lambda: rng.expovariate(rate))
+    if kind == "bimodal":
+        small, large, p = args.split(",")
+        small, large = sampler("uniform:" + small, rng, integer), sampler("uniform:" + large, rng, integer)
+        p = float(p)
+        return lambda: small() if rng.random() < p else large()
+    if kind == "fixed":
+        value = int(args) if integer else float(args)
+        return lambda: value
+    if kind == "trace":
+        counts = sorted(trace_histogram(args).items())
+        values = [v for v, _ in counts]
+        cum = list(itertools.accumulate(c for _, c in counts))
+        total = cum[-1]
+        return lambda: values[bisect_right(cum, rng.random() * total)]
+    raise ValueError(f"Distribución desconocida: {spec}")
+
+
+def size_sampler(spec, rng):
+    """Sorteo de tamaños enteros (ver sampler)"""
+    return sampler(spec, rng)
+
+
+def arrivals(sizes="uniform:1-20", lifetimes="exp:50", rate=1.0, seed=0, count=None):
+    """Genera (llegada, nombre, tamaño, duración) de cada proceso en orden de llegada.
+
+    ``count`` limita el número de procesos (None = infinito).
+    """
+    rng = random.Random(seed)
+    size, life = sampler(sizes, rng), sampler(lifetimes, rng, integer=False)
+    t = 0.0
+    for i in itertools.count(1) if count is None else range(1, count + 1):
+        t += rng.expovariate(rate)
+        yield t, f"P{i}", size(), life()
+
+
+def timed_events(sizes="uniform:1-20", lifetimes="exp:50", rate=1.0, seed=0, count=None, drain=True):
+    """Genera (tiempo, op, nombre, tamaño) en orden de tiempo.
+
+    Cada proceso se libera al cumplir su duración desde la llegada; con drain
+    se emiten al final las liberaciones pendientes.
+    """
+    pending = []  # (tiempo de liberación, nombre)
+    for t, name, size, duration in arrivals(sizes, lifetimes, rate, seed, count):
+        while pending and pending[0][0] <= t:
+            end, done = heapq.heappop(pending)
+            yield end, FREE, done, 0
+        yield t, ALLOC, name, size
+        heapq.heappush(pending, (t + duration, name))
+    while drain and pending:
+        end, done = heapq.heappop(pending)
+        yield end, FREE, done, 0
+
+
+def events(*args, **kwargs):
+    """Como timed_events pero con tuplas (op, nombre, tamaño), las que consume replay()"""
+    return ((op, name, size) for _, op, name, size in timed_events(*args, **kwargs))
+
+
+def main(argv=None):
+    from replay import format_report, make_manager, replay, write_binary
+    from strategies import STRATEGIES
+
+    ap = argparse.ArgumentParser(description="Genera una carga sintética y la reproduce o la guarda")
+    ap.add_argument("--sizes", default="uniform:1-20", help="distribución de tamaños")
+    ap.add_argument("--lifetimes", default="exp:50", help="distribución de tiempos de vida")
+    ap.add_argument("--rate", type=float, default=1.0, help="llegadas por unidad de tiempo")
+    ap.add_argument("--events", type=int, help="número de asignaciones (por defecto infinito)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--memory", type=int, default=1000)
+    ap.add_argument("--strategy", choices=sorted(STRATEGIES) + ["buddy"], default="worst")
+    ap.add_argument("--out", metavar="SALIDA", help="escribe la carga como traza binaria en vez de reproducirla")
+    args = ap.parse_args(argv)
+
+    stream = events(args.sizes, args.lifetimes, args.rate, args.seed, args.events)
+    if args.out:
+        with open(args.out, "wb") as out:
+            write_binary(stream, out)
+        return 0
+    print(format_report(replay(stream, make_manager(args.memory, strategy=args.strategy, history_size=0))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())